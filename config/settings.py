@@ -2,70 +2,169 @@
 Settings module for the Stellar Trading Bot
 """
 import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Mapping, Optional
+
 from loguru import logger
+from stellar_sdk import Network
+
+# Passphrase and default Horizon server for each supported network
+NETWORK_PASSPHRASES = {
+    'TESTNET': Network.TESTNET_NETWORK_PASSPHRASE,
+    'PUBLIC': Network.PUBLIC_NETWORK_PASSPHRASE
+}
+DEFAULT_HORIZON_URLS = {
+    'TESTNET': 'https://horizon-testnet.stellar.org',
+    'PUBLIC': 'https://horizon.stellar.org'
+}
 
+@dataclass(frozen=True)
 class Settings:
-    """Settings class to manage configuration"""
+    """
+    Settings class to manage configuration
     
-    def __init__(self):
-        """Initialize settings from environment variables"""
-        # Stellar account settings
-        self.stellar_secret_key = os.getenv('STELLAR_SECRET_KEY')
-        self.stellar_public_key = os.getenv('STELLAR_PUBLIC_KEY')
-        
+    Settings are immutable once loaded; use Settings.from_env() to build
+    them from environment variables.
+    """
+    
+    # Declared by hand rather than with dataclass(slots=True), which needs
+    # Python 3.10; must list every field below
+    __slots__ = (
+        'stellar_secret_key', 'stellar_public_key',
+        'network', 'horizon_url',
+        'base_asset', 'quote_asset', 'quote_asset_issuer', 'trade_amount',
+        'max_spread', 'min_profit', 'polling_interval', 'account_cache_ttl',
+        'buy_threshold', 'sell_threshold', 'max_xlm_per_trade', 'max_usdc_per_trade',
+        'price_check_interval', 'trading_enabled',
+        'strategy', 'cpu_pin',
+        'log_level',
+    )
+    
+    # Stellar account settings
+    stellar_secret_key: str
+    stellar_public_key: Optional[str]
+    
+    # Network settings
+    network: str
+    horizon_url: str
+    
+    # Trading parameters
+    base_asset: str
+    quote_asset: str
+    quote_asset_issuer: Optional[str]
+    trade_amount: float
+    max_spread: float
+    min_profit: float
+    polling_interval: int
+    account_cache_ttl: float
+    
+    # XLM/USDC strategy specific settings
+    buy_threshold: float
+    sell_threshold: float
+    max_xlm_per_trade: float
+    max_usdc_per_trade: float
+    price_check_interval: int
+    trading_enabled: bool
+    
+    # Bot settings
+    strategy: str
+    cpu_pin: Optional[int]
+    
+    # Logging
+    log_level: str
+    
+    def __post_init__(self):
+        """Validate settings, raising ValueError on bad configuration"""
         if not self.stellar_secret_key:
             logger.error("STELLAR_SECRET_KEY not set in environment variables")
             raise ValueError("STELLAR_SECRET_KEY is required")
         
+        if self.quote_asset != 'XLM' and not self.quote_asset_issuer:
+            logger.error(f"QUOTE_ASSET_ISSUER not set for {self.quote_asset}")
+            raise ValueError(f"Missing issuer for {self.quote_asset}")
+    
+    @classmethod
+    def from_env(cls, env: Mapping[str, str]) -> 'Settings':
+        """
+        Initialize settings from environment variables
+        
+        Args:
+            env: Environment mapping, normally a snapshot from os.environ.copy()
+                so every lookup is a plain dict access
+            
+        Returns:
+            Settings instance
+        """
         # Network settings
-        self.network = os.getenv('STELLAR_NETWORK', 'TESTNET')
-        if self.network not in ['TESTNET', 'PUBLIC']:
-            logger.warning(f"Invalid network {self.network}, defaulting to TESTNET")
-            self.network = 'TESTNET'
+        network = env.get('STELLAR_NETWORK', 'TESTNET')
+        if network not in NETWORK_PASSPHRASES:
+            logger.warning(f"Invalid network {network}, defaulting to TESTNET")
+            network = 'TESTNET'
         
         # Set Horizon URL based on network if not explicitly provided
-        self.horizon_url = os.getenv('HORIZON_URL')
-        if not self.horizon_url:
-            if self.network == 'TESTNET':
-                self.horizon_url = 'https://horizon-testnet.stellar.org'
-            else:
-                self.horizon_url = 'https://horizon.stellar.org'
-        
-        # Trading parameters
-        self.base_asset = os.getenv('BASE_ASSET', 'XLM')
-        self.quote_asset = os.getenv('QUOTE_ASSET', 'USDC')
-        self.quote_asset_issuer = os.getenv('QUOTE_ASSET_ISSUER')
+        horizon_url = env.get('HORIZON_URL') or DEFAULT_HORIZON_URLS[network]
         
         # Convert numeric settings
         try:
-            self.trade_amount = float(os.getenv('TRADE_AMOUNT', '10'))
-            self.max_spread = float(os.getenv('MAX_SPREAD', '0.01'))
-            self.min_profit = float(os.getenv('MIN_PROFIT', '0.005'))
-            self.polling_interval = int(os.getenv('POLLING_INTERVAL', '60'))
-            
-            # XLM/USDC strategy specific settings
-            self.buy_threshold = float(os.getenv('BUY_THRESHOLD', '0.2'))
-            self.sell_threshold = float(os.getenv('SELL_THRESHOLD', '0.3'))
-            self.max_xlm_per_trade = float(os.getenv('MAX_XLM_PER_TRADE', '100'))
-            self.max_usdc_per_trade = float(os.getenv('MAX_USDC_PER_TRADE', '30'))
-            self.price_check_interval = int(os.getenv('PRICE_CHECK_INTERVAL', '300'))
-            self.trading_enabled = os.getenv('TRADING_ENABLED', 'true').lower() == 'true'
+            polling_interval = int(env.get('POLLING_INTERVAL', '60'))
+            numeric_settings = dict(
+                trade_amount=float(env.get('TRADE_AMOUNT', '10')),
+                max_spread=float(env.get('MAX_SPREAD', '0.01')),
+                min_profit=float(env.get('MIN_PROFIT', '0.005')),
+                polling_interval=polling_interval,
+                # Balances are reused for half a polling interval by default
+                account_cache_ttl=float(env.get('ACCOUNT_CACHE_TTL', polling_interval / 2)),
+                
+                # XLM/USDC strategy specific settings
+                buy_threshold=float(env.get('BUY_THRESHOLD', '0.2')),
+                sell_threshold=float(env.get('SELL_THRESHOLD', '0.3')),
+                max_xlm_per_trade=float(env.get('MAX_XLM_PER_TRADE', '100')),
+                max_usdc_per_trade=float(env.get('MAX_USDC_PER_TRADE', '30')),
+                price_check_interval=int(env.get('PRICE_CHECK_INTERVAL', '300'))
+            )
         except ValueError as e:
             logger.error(f"Error parsing numeric settings: {str(e)}")
             raise
         
-        # Bot settings
-        self.strategy = os.getenv('STRATEGY', 'xlm_usdc_simple')
-        
-        # Logging
-        self.log_level = os.getenv('LOG_LEVEL', 'INFO')
+        return cls(
+            # Stellar account settings
+            stellar_secret_key=env.get('STELLAR_SECRET_KEY'),
+            stellar_public_key=env.get('STELLAR_PUBLIC_KEY'),
+            network=network,
+            horizon_url=horizon_url,
+            
+            # Trading parameters
+            base_asset=env.get('BASE_ASSET', 'XLM'),
+            quote_asset=env.get('QUOTE_ASSET', 'USDC'),
+            quote_asset_issuer=env.get('QUOTE_ASSET_ISSUER'),
+            trading_enabled=env.get('TRADING_ENABLED', 'true').lower() == 'true',
+            
+            # Bot settings
+            strategy=env.get('STRATEGY', 'xlm_usdc_simple'),
+            cpu_pin=int(env['CPU_PIN']) if env.get('CPU_PIN') else None,
+            
+            # Logging
+            log_level=env.get('LOG_LEVEL', 'INFO'),
+            
+            **numeric_settings
+        )
     
-    def validate(self):
-        """Validate settings"""
-        if not self.stellar_secret_key:
-            return False, "Missing STELLAR_SECRET_KEY"
-        
-        if self.quote_asset != 'XLM' and not self.quote_asset_issuer:
-            return False, f"Missing issuer for {self.quote_asset}"
-        
-        return True, "Settings valid"
+    @property
+    def network_passphrase(self) -> str:
+        """Network passphrase for the configured network"""
+        return NETWORK_PASSPHRASES[self.network]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the process-wide Settings instance
+    
+    The environment is parsed on the first call only; later calls return
+    the same instance.
+    
+    Returns:
+        Settings instance
+    """
+    return Settings.from_env(os.environ.copy())
@@ -3,47 +3,52 @@
 Utility script to set up a USDC trustline for the Stellar Trading Bot
 """
 import os
+import sys
 from dotenv import load_dotenv
-from stellar_sdk import (
-    Asset, Keypair, Network, Server, TransactionBuilder
-)
+from loguru import logger
 
 def setup_usdc_trustline():
     """Set up a trustline for USDC on the account"""
+    # Imported here so importing this module doesn't pull in the whole SDK
+    from stellar_sdk import (
+        Asset, Keypair, Server, TransactionBuilder
+    )
+    
+    from config.settings import DEFAULT_HORIZON_URLS, NETWORK_PASSPHRASES
+    
     # Load environment variables from .env file
     load_dotenv()
+    env = os.environ.copy()
     
     # Get the secret key from environment variables
-    secret_key = os.getenv('STELLAR_SECRET_KEY')
+    secret_key = env.get('STELLAR_SECRET_KEY')
     if not secret_key:
-        print("Error: STELLAR_SECRET_KEY not found in environment variables")
+        logger.error("STELLAR_SECRET_KEY not found in environment variables")
         return False
     
     # Get the USDC issuer
-    usdc_issuer = os.getenv('QUOTE_ASSET_ISSUER')
-    usdc_asset_code = os.getenv('QUOTE_ASSET_USDC', 'USDC')
+    usdc_issuer = env.get('QUOTE_ASSET_ISSUER')
+    usdc_asset_code = env.get('QUOTE_ASSET_USDC', 'USDC')
     
     if not usdc_issuer:
-        print("Error: QUOTE_ASSET_ISSUER not found in environment variables")
+        logger.error("QUOTE_ASSET_ISSUER not found in environment variables")
         return False
         
     # Connect to Stellar
-    network = os.getenv('STELLAR_NETWORK', 'PUBLIC')
-    if network == 'TESTNET':
-        horizon_url = os.getenv('HORIZON_URL', 'https://horizon-testnet.stellar.org')
-        network_passphrase = Network.TESTNET_NETWORK_PASSPHRASE
-    else:
-        horizon_url = os.getenv('HORIZON_URL', 'https://horizon.stellar.org')
-        network_passphrase = Network.PUBLIC_NETWORK_PASSPHRASE
+    network = env.get('STELLAR_NETWORK', 'PUBLIC')
+    if network != 'TESTNET':
+        network = 'PUBLIC'
+    horizon_url = env.get('HORIZON_URL', DEFAULT_HORIZON_URLS[network])
+    network_passphrase = NETWORK_PASSPHRASES[network]
     
     # Set up server and keypair
     server = Server(horizon_url)
     keypair = Keypair.from_secret(secret_key)
     public_key = keypair.public_key
     
-    print(f"Setting up USDC trustline for account: {public_key}")
-    print(f"USDC Issuer: {usdc_issuer}")
-    print(f"Network: {network}")
+    logger.info(f"Setting up USDC trustline for account: {public_key}")
+    logger.info(f"USDC Issuer: {usdc_issuer}")
+    logger.info(f"Network: {network}")
     
     try:
         # Create a trustline for USDC
@@ -72,13 +77,17 @@ def setup_usdc_trustline():
         
         # Submit the transaction
         response = server.submit_transaction(transaction)
-        print("Trustline established successfully!")
-        print(f"Transaction Hash: {response['hash']}")
+        logger.info("Trustline established successfully!")
+        logger.info(f"Transaction Hash: {response['hash']}")
         return True
         
     except Exception as e:
-        print(f"Error establishing trustline: {str(e)}")
+        logger.error(f"Error establishing trustline: {str(e)}")
         return False
 
 if __name__ == "__main__":
+    # Plain message output on stdout, where this script has always printed
+    logger.remove()
+    logger.add(sys.stdout, format="{message}")
+    
     setup_usdc_trustline()
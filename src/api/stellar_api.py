@@ -1,18 +1,110 @@
 """
 Stellar API module for interacting with the Stellar network
 """
-from typing import Dict, List, Optional, Union
-from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from decimal import ROUND_DOWN, Decimal
+from functools import lru_cache
+import threading
 import time
 
-from stellar_sdk import (
-    Server, Keypair, TransactionBuilder, Network, Asset, 
-    Operation, ChangeTrust, Payment, PathPaymentStrictReceive,
-    PathPaymentStrictSend, ManageBuyOffer, ManageSellOffer
+from stellar_sdk import Server, Keypair, TransactionBuilder, Account, Asset
+from stellar_sdk.client.requests_client import RequestsClient
+from stellar_sdk.exceptions import (
+    BadRequestError, BadResponseError, ConnectionError, NotFoundError
 )
-from stellar_sdk.exceptions import BadRequestError, NotFoundError
 from loguru import logger
 
+from config.settings import DEFAULT_HORIZON_URLS, NETWORK_PASSPHRASES
+
+# How many times a submission is resent after a Horizon timeout or dropped connection
+_SUBMIT_RETRIES = 2
+
+# Client-side pacing for Horizon requests. SDF's public Horizon allows 3600
+# requests per hour per IP; the burst covers a full strategy cycle
+_HORIZON_REQUESTS_PER_SECOND = 1.0
+_HORIZON_REQUEST_BURST = 10
+
+# Smallest unit Stellar amounts can express (1 stroop = 0.0000001)
+_STROOP = Decimal('0.0000001')
+
+def _quantize_stroops(value: Union[str, Decimal]) -> str:
+    """
+    Format an amount or price for submission to Horizon
+    
+    Strategies keep values as Decimal through their calculations; this
+    rounds once, at the API boundary, down to Stellar's 7 decimal places
+    so we never offer more than was computed.
+    
+    Args:
+        value: Decimal or numeric string
+        
+    Returns:
+        String with at most 7 decimal places
+    """
+    return format(Decimal(value).quantize(_STROOP, rounding=ROUND_DOWN), 'f')
+
+@lru_cache(maxsize=None)
+def _cached_asset(code: str, issuer: Optional[str]) -> Asset:
+    """
+    Build an Asset once per (code, issuer)
+    
+    The bot trades a fixed pair, so the same handful of assets is requested
+    on every order; Asset construction validates the code and issuer each
+    time, which this skips after the first call.
+    """
+    if code == 'XLM' or code == 'native':
+        return Asset.native()
+    else:
+        if not issuer:
+            raise ValueError(f"Issuer is required for asset {code}")
+        return Asset(code, issuer)
+
+class _TokenBucket:
+    """Thread-safe token bucket that paces outgoing requests"""
+    
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket
+        
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum tokens held (largest allowed burst)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until it is available if the bucket is empty"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            # Reserve the token now, so concurrent callers queue up behind us
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        
+        if wait:
+            time.sleep(wait)
+
+# Shared by every StellarAPI instance: Horizon limits requests per client IP,
+# not per strategy
+_horizon_rate_limiter = _TokenBucket(rate=_HORIZON_REQUESTS_PER_SECOND, capacity=_HORIZON_REQUEST_BURST)
+
+class _RateLimitedClient(RequestsClient):
+    """RequestsClient that waits for the shared rate limiter before each request"""
+    
+    def get(self, *args, **kwargs):
+        _horizon_rate_limiter.acquire()
+        return super().get(*args, **kwargs)
+    
+    def post(self, *args, **kwargs):
+        _horizon_rate_limiter.acquire()
+        return super().post(*args, **kwargs)
+
 class StellarAPI:
     """Class to interact with the Stellar network"""
     
@@ -28,18 +120,179 @@ class StellarAPI:
         self.keypair = Keypair.from_secret(secret_key)
         self.account_id = self.keypair.public_key
         
-        # Set network and server
-        if network == 'TESTNET':
-            self.network = Network.TESTNET_NETWORK_PASSPHRASE
-            self.horizon_url = horizon_url or 'https://horizon-testnet.stellar.org'
-        else:
-            self.network = Network.PUBLIC_NETWORK_PASSPHRASE
-            self.horizon_url = horizon_url or 'https://horizon.stellar.org'
+        # Set network and server (anything other than TESTNET means PUBLIC)
+        if network != 'TESTNET':
+            network = 'PUBLIC'
+        self.network = NETWORK_PASSPHRASES[network]
+        self.horizon_url = horizon_url or DEFAULT_HORIZON_URLS[network]
+        
+        # The SDK's client already keeps one pooled keep-alive session and
+        # retries 429/503/504 honoring Retry-After; only the pool is sized here
+        self.server = Server(
+            horizon_url=self.horizon_url,
+            client=_RateLimitedClient(pool_size=8)
+        )
+        
+        # Source account is loaded lazily and reused across transactions
+        self._account = None
+        
+        # Balance lookup index for the last fetched account snapshot
+        self._balance_index_entry = None  # (account_info, index) for the latest snapshot
         
-        self.server = Server(horizon_url=self.horizon_url)
         logger.debug(f"Initialized Stellar API for account {self.account_id}")
         logger.debug(f"Using network: {network}, Horizon URL: {self.horizon_url}")
     
+    def close(self):
+        """Close the Horizon client and its pooled connections"""
+        self.server.close()
+    
+    def _get_account(self):
+        """
+        Get the source account used to build transactions
+        
+        The account is loaded from Horizon once and then reused.
+        TransactionBuilder.build() increments its sequence number locally,
+        so consecutive transactions don't need a round-trip to refresh it.
+        
+        Returns:
+            Account object
+        """
+        if self._account is None:
+            self._account = self.server.load_account(self.account_id)
+        return self._account
+    
+    def _new_tx_builder(self) -> TransactionBuilder:
+        """
+        Start a transaction from the cached source account
+        
+        The network passphrase, base fee and timeout are the same for every
+        transaction the bot sends, so they are applied here once.
+        
+        Returns:
+            TransactionBuilder ready for operations to be appended
+        """
+        return TransactionBuilder(
+            source_account=self._get_account(),
+            network_passphrase=self.network,
+            base_fee=100
+        ).set_timeout(30)
+    
+    def _submit(self, transaction) -> Dict:
+        """
+        Sign and submit a transaction
+        
+        The signed envelope is serialized once and kept. If Horizon times out
+        (5xx) or the connection drops, the same XDR is resubmitted without
+        re-signing; that's safe because a given envelope can only be applied
+        once. If Horizon rejects the sequence number (tx_bad_seq) on the first
+        copy of an envelope, the account is reloaded and the operations are
+        rebuilt onto a fresh sequence once. If it does so after a resend, an
+        earlier copy has most likely been applied already, so that
+        transaction is looked up by hash and returned instead; rebuilding
+        would place the operations twice.
+        
+        If submission ultimately fails the cached account is dropped, since we
+        can no longer be sure which sequence number Horizon expects next. It is
+        reloaded on the next transaction.
+        
+        Args:
+            transaction: Transaction envelope built from the cached account
+            
+        Returns:
+            Horizon response
+        """
+        transaction.sign(self.keypair)
+        xdr = transaction.to_xdr()
+        resequenced = False
+        resent = False  # Whether an earlier copy of this envelope may have been applied
+        attempt = 0
+        
+        while True:
+            try:
+                return self.server.submit_transaction(xdr)
+            except (BadResponseError, ConnectionError) as e:
+                if attempt >= _SUBMIT_RETRIES:
+                    self._account = None
+                    raise
+                attempt += 1
+                resent = True
+                logger.warning(f"Transaction submission failed ({str(e)}), resubmitting "
+                               f"(attempt {attempt}/{_SUBMIT_RETRIES})")
+                time.sleep(attempt)
+            except BadRequestError as e:
+                self._account = None
+                result_codes = (e.extras or {}).get('result_codes', {})
+                if result_codes.get('transaction') != 'tx_bad_seq':
+                    raise
+                if resent:
+                    # The sequence most likely moved because an earlier copy landed
+                    applied = self._find_transaction(transaction.hash_hex())
+                    if applied is None:
+                        raise
+                    logger.warning("Resubmission rejected with tx_bad_seq, but an earlier copy "
+                                   "was applied as {}", applied.get('hash'))
+                    return applied
+                if resequenced:
+                    raise
+                logger.warning("Transaction rejected with tx_bad_seq, rebuilding with a fresh sequence")
+                transaction = self._rebuild(transaction)
+                transaction.sign(self.keypair)
+                xdr = transaction.to_xdr()
+                resequenced = True
+            except Exception:
+                self._account = None
+                raise
+    
+    def _find_transaction(self, tx_hash: str) -> Optional[Dict]:
+        """
+        Look up a transaction that may have been applied already
+        
+        Args:
+            tx_hash: Hex-encoded transaction hash
+            
+        Returns:
+            Horizon transaction record if it was applied successfully, else None
+        """
+        try:
+            record = self.server.transactions().transaction(tx_hash).call()
+        except NotFoundError:
+            return None
+        return record if record.get('successful') else None
+    
+    def _rebuild(self, transaction):
+        """
+        Rebuild a transaction's operations onto the current account sequence
+        
+        Args:
+            transaction: Previously built transaction envelope
+            
+        Returns:
+            New unsigned transaction envelope with the same operations and memo
+        """
+        builder = self._new_tx_builder()
+        for operation in transaction.transaction.operations:
+            builder.append_operation(operation)
+        builder.add_memo(transaction.transaction.memo)
+        return builder.build()
+    
+    def warmup(self) -> Dict:
+        """
+        Prime the account caches with a single Horizon request
+        
+        The account info fetched at startup already carries the sequence
+        number, so the transaction source account is seeded from it rather
+        than loaded separately before the first trade, and the balance index
+        is built from the same snapshot.
+        
+        Returns:
+            Dict containing account information, as from get_account_info()
+        """
+        account_info = self.get_account_info()
+        if self._account is None:
+            self._account = Account(self.account_id, int(account_info['sequence']))
+        self._balance_index(account_info)
+        return account_info
+    
     def get_account_info(self) -> Dict:
         """
         Get account information
@@ -63,29 +316,94 @@ class StellarAPI:
             logger.error(f"Account {self.account_id} not found")
             raise
     
-    def get_balance(self, asset_code: str = 'XLM', asset_issuer: Optional[str] = None) -> Decimal:
+    def stream_account(self) -> Iterator[Dict]:
+        """
+        Stream account updates
+        
+        Horizon pushes the account over server-sent events whenever it
+        changes (including balance changes from filled offers), starting
+        with its current state. Iteration blocks until the next update.
+        
+        Returns:
+            Iterator of account info dicts, in the same shape as get_account_info()
+        """
+        for account_call in self.server.accounts().account_id(self.account_id).stream():
+            yield {
+                'account_id': self.account_id,
+                'sequence': account_call.get('sequence'),
+                'balances': account_call.get('balances', [])
+            }
+    
+    def get_balance(
+        self, 
+        asset_code: str = 'XLM', 
+        asset_issuer: Optional[str] = None,
+        account_info: Optional[Dict] = None
+    ) -> Decimal:
         """
         Get balance for a specific asset
         
         Args:
             asset_code: The asset code (default: XLM)
             asset_issuer: The asset issuer (required for non-native assets)
+            account_info: Optional result of get_account_info() to read from
+                instead of fetching the account again
             
         Returns:
             Decimal balance of the asset
         """
-        # Use the accounts endpoint to get account details
-        account_call = self.server.accounts().account_id(self.account_id).call()
-        balances = account_call.get('balances', [])
+        if account_info is None:
+            account_info = self.get_account_info()
         
-        for balance in balances:
-            if asset_code == 'XLM' and balance.get('asset_type') == 'native':
-                return Decimal(balance.get('balance', '0'))
-            elif (balance.get('asset_code') == asset_code and 
-                  balance.get('asset_issuer') == asset_issuer):
-                return Decimal(balance.get('balance', '0'))
-                
-        return Decimal('0')
+        key = ('XLM', None) if asset_code == 'XLM' else (asset_code, asset_issuer)
+        return self._balance_index(account_info).get(key, Decimal('0'))
+    
+    def get_all_balances(self, account_info: Optional[Dict] = None) -> Dict[Tuple[str, Optional[str]], Decimal]:
+        """
+        Get every balance on the account from a single account fetch
+        
+        Args:
+            account_info: Optional result of get_account_info() to read from
+                instead of fetching the account again
+            
+        Returns:
+            Dict mapping (asset_code, asset_issuer) to Decimal balance,
+            with the native asset stored under ('XLM', None)
+        """
+        if account_info is None:
+            account_info = self.get_account_info()
+        
+        return dict(self._balance_index(account_info))
+    
+    def _balance_index(self, account_info: Dict) -> Dict[Tuple[str, Optional[str]], Decimal]:
+        """
+        Index an account's balances by (asset_code, asset_issuer)
+        
+        The index for the most recent account_info is kept, so repeated
+        lookups against the same snapshot are plain dict hits. It is keyed on
+        the snapshot itself rather than the sequence number, because filled
+        offers change balances without bumping the sequence.
+        
+        Args:
+            account_info: Result of get_account_info()
+            
+        Returns:
+            Dict mapping (asset_code, asset_issuer) to Decimal balance,
+            with the native asset stored under ('XLM', None)
+        """
+        # Snapshot and index are swapped in as one tuple, so a lookup from
+        # another thread (e.g. an account stream) never pairs one snapshot
+        # with another's index
+        entry = self._balance_index_entry
+        if entry is None or entry[0] is not account_info:
+            entry = (account_info, {
+                (('XLM', None) if balance.get('asset_type') == 'native'
+                 else (balance.get('asset_code'), balance.get('asset_issuer'))):
+                    Decimal(balance.get('balance', '0'))
+                for balance in account_info['balances']
+            })
+            self._balance_index_entry = entry
+        return entry[1]
     
     def create_asset(self, code: str, issuer: Optional[str] = None) -> Asset:
         """
@@ -98,12 +416,7 @@ class StellarAPI:
         Returns:
             Asset object
         """
-        if code == 'XLM' or code == 'native':
-            return Asset.native()
-        else:
-            if not issuer:
-                raise ValueError(f"Issuer is required for asset {code}")
-            return Asset(code, issuer)
+        return _cached_asset(code, issuer)
     
     def trust_asset(self, asset_code: str, asset_issuer: str, limit: Optional[str] = None) -> Dict:
         """
@@ -117,22 +430,15 @@ class StellarAPI:
         Returns:
             Dict with transaction details
         """
-        asset = Asset(asset_code, asset_issuer)
+        asset = _cached_asset(asset_code, asset_issuer)
         
-        account = self.server.load_account(self.account_id)
         transaction = (
-            TransactionBuilder(
-                source_account=account,
-                network_passphrase=self.network,
-                base_fee=100
-            )
+            self._new_tx_builder()
             .append_change_trust_op(asset=asset, limit=limit)
-            .set_timeout(30)
             .build()
         )
         
-        transaction.sign(self.keypair)
-        response = self.server.submit_transaction(transaction)
+        response = self._submit(transaction)
         
         logger.info(f"Created trustline for {asset_code} (issuer: {asset_issuer})")
         return {
@@ -165,19 +471,42 @@ class StellarAPI:
                 'bids': [{'price': '0.19', 'amount': '1000.0'}]  # Default bid price
             }
     
+    def stream_order_book(self, selling_asset: Asset, buying_asset: Asset, limit: int = 20) -> Iterator[Dict]:
+        """
+        Stream order book updates for a trading pair
+        
+        Horizon pushes a fresh order book over server-sent events whenever
+        the book changes, so callers can keep a live copy without polling.
+        Iteration blocks until the next update arrives.
+        
+        Args:
+            selling_asset: The asset to sell
+            buying_asset: The asset to buy
+            limit: Number of orders to return on each side
+            
+        Returns:
+            Iterator of order book dicts, in the same shape as get_order_book()
+        """
+        return self.server.orderbook(selling=selling_asset, buying=buying_asset).limit(limit).stream()
+    
     def create_sell_offer(
         self, 
         selling_code: str, 
         selling_issuer: Optional[str], 
         buying_code: str, 
         buying_issuer: Optional[str],
-        amount: str,
-        price: str,
-        offer_id: int = 0
+        amount: Union[str, Decimal],
+        price: Union[str, Decimal],
+        offer_id: int = 0,
+        selling_asset: Optional[Asset] = None,
+        buying_asset: Optional[Asset] = None
     ) -> Dict:
         """
         Create a sell offer
         
+        If an Asset is given for a side it is used as is, rather than being
+        built from that side's code and issuer.
+        
         Args:
             selling_code: Code of the asset to sell
             selling_issuer: Issuer of the asset to sell (None for XLM)
@@ -186,20 +515,23 @@ class StellarAPI:
             amount: Amount to sell
             price: Price in terms of buying asset
             offer_id: Offer ID (0 for new offer)
+            selling_asset: Asset to sell, instead of selling_code/selling_issuer
+            buying_asset: Asset to buy, instead of buying_code/buying_issuer
             
         Returns:
             Dict with transaction details
         """
-        selling_asset = self.create_asset(selling_code, selling_issuer)
-        buying_asset = self.create_asset(buying_code, buying_issuer)
+        if selling_asset is None:
+            selling_asset = self.create_asset(selling_code, selling_issuer)
+        if buying_asset is None:
+            buying_asset = self.create_asset(buying_code, buying_issuer)
+        
+        # Log exactly what is submitted, not the caller's unrounded values
+        amount = _quantize_stroops(amount)
+        price = _quantize_stroops(price)
         
-        account = self.server.load_account(self.account_id)
         transaction = (
-            TransactionBuilder(
-                source_account=account,
-                network_passphrase=self.network,
-                base_fee=100
-            )
+            self._new_tx_builder()
             .append_manage_sell_offer_op(
                 selling=selling_asset,
                 buying=buying_asset,
@@ -207,15 +539,13 @@ class StellarAPI:
                 price=price,
                 offer_id=offer_id
             )
-            .set_timeout(30)
             .build()
         )
         
-        transaction.sign(self.keypair)
-        response = self.server.submit_transaction(transaction)
+        response = self._submit(transaction)
         
         logger.info(
-            f"Created sell offer: {amount} {selling_code} for {buying_code} at price {price}"
+            f"Created sell offer: {amount} {selling_asset.code} for {buying_asset.code} at price {price}"
         )
         return {
             'success': True,
@@ -229,13 +559,18 @@ class StellarAPI:
         buying_issuer: Optional[str], 
         selling_code: str, 
         selling_issuer: Optional[str],
-        amount: str,
-        price: str,
-        offer_id: int = 0
+        amount: Union[str, Decimal],
+        price: Union[str, Decimal],
+        offer_id: int = 0,
+        buying_asset: Optional[Asset] = None,
+        selling_asset: Optional[Asset] = None
     ) -> Dict:
         """
         Create a buy offer
         
+        If an Asset is given for a side it is used as is, rather than being
+        built from that side's code and issuer.
+        
         Args:
             buying_code: Code of the asset to buy
             buying_issuer: Issuer of the asset to buy (None for XLM)
@@ -244,20 +579,23 @@ class StellarAPI:
             amount: Amount to buy
             price: Price in terms of selling asset
             offer_id: Offer ID (0 for new offer)
+            buying_asset: Asset to buy, instead of buying_code/buying_issuer
+            selling_asset: Asset to sell, instead of selling_code/selling_issuer
             
         Returns:
             Dict with transaction details
         """
-        buying_asset = self.create_asset(buying_code, buying_issuer)
-        selling_asset = self.create_asset(selling_code, selling_issuer)
+        if buying_asset is None:
+            buying_asset = self.create_asset(buying_code, buying_issuer)
+        if selling_asset is None:
+            selling_asset = self.create_asset(selling_code, selling_issuer)
+        
+        # Log exactly what is submitted, not the caller's unrounded values
+        amount = _quantize_stroops(amount)
+        price = _quantize_stroops(price)
         
-        account = self.server.load_account(self.account_id)
         transaction = (
-            TransactionBuilder(
-                source_account=account,
-                network_passphrase=self.network,
-                base_fee=100
-            )
+            self._new_tx_builder()
             .append_manage_buy_offer_op(
                 buying=buying_asset,
                 selling=selling_asset,
@@ -265,15 +603,13 @@ class StellarAPI:
                 price=price,
                 offer_id=offer_id
             )
-            .set_timeout(30)
             .build()
         )
         
-        transaction.sign(self.keypair)
-        response = self.server.submit_transaction(transaction)
+        response = self._submit(transaction)
         
         logger.info(
-            f"Created buy offer: {amount} {buying_code} with {selling_code} at price {price}"
+            f"Created buy offer: {amount} {buying_asset.code} with {selling_asset.code} at price {price}"
         )
         return {
             'success': True,
@@ -292,44 +628,37 @@ class StellarAPI:
             Dict with transaction details
         """
         # To cancel an offer, we update it with amount=0
-        account = self.server.load_account(self.account_id)
-        
-        # First, we need to get the offer details
-        offers = self.server.offers().for_account(self.account_id).call()
-        offer = None
         
-        for record in offers['_embedded']['records']:
-            if int(record['id']) == offer_id:
-                offer = record
-                break
+        # First, we need to get the offer details. Fetch the single offer
+        # by ID rather than paging through all of the account's offers
+        try:
+            offer = self.server.offers().offer(offer_id).call()
+        except NotFoundError:
+            offer = None
         
-        if not offer:
+        if not offer or offer.get('seller') != self.account_id:
             raise ValueError(f"Offer with ID {offer_id} not found")
         
         # Get the assets from the offer
         if offer['selling']['asset_type'] == 'native':
-            selling_asset = Asset.native()
+            selling_asset = _cached_asset('XLM', None)
         else:
-            selling_asset = Asset(
+            selling_asset = _cached_asset(
                 offer['selling']['asset_code'], 
                 offer['selling']['asset_issuer']
             )
         
         if offer['buying']['asset_type'] == 'native':
-            buying_asset = Asset.native()
+            buying_asset = _cached_asset('XLM', None)
         else:
-            buying_asset = Asset(
+            buying_asset = _cached_asset(
                 offer['buying']['asset_code'], 
                 offer['buying']['asset_issuer']
             )
         
         # Create a transaction to cancel the offer
         transaction = (
-            TransactionBuilder(
-                source_account=account,
-                network_passphrase=self.network,
-                base_fee=100
-            )
+            self._new_tx_builder()
             .append_manage_sell_offer_op(
                 selling=selling_asset,
                 buying=buying_asset,
@@ -337,12 +666,10 @@ class StellarAPI:
                 price="1",   # Price doesn't matter when cancelling
                 offer_id=offer_id
             )
-            .set_timeout(30)
             .build()
         )
         
-        transaction.sign(self.keypair)
-        response = self.server.submit_transaction(transaction)
+        response = self._submit(transaction)
         
         logger.info(f"Cancelled offer with ID {offer_id}")
         return {
@@ -365,7 +692,7 @@ class StellarAPI:
         self, 
         destination: str, 
         asset_code: str, 
-        amount: str, 
+        amount: Union[str, Decimal], 
         asset_issuer: Optional[str] = None,
         memo_text: Optional[str] = None
     ) -> Dict:
@@ -383,13 +710,9 @@ class StellarAPI:
             Dict with transaction details
         """
         asset = self.create_asset(asset_code, asset_issuer)
+        amount = _quantize_stroops(amount)
         
-        account = self.server.load_account(self.account_id)
-        transaction_builder = TransactionBuilder(
-            source_account=account,
-            network_passphrase=self.network,
-            base_fee=100
-        )
+        transaction_builder = self._new_tx_builder()
         
         # Add memo if provided
         if memo_text:
@@ -402,12 +725,9 @@ class StellarAPI:
             amount=amount
         )
         
-        # Build and sign transaction
-        transaction = transaction_builder.set_timeout(30).build()
-        transaction.sign(self.keypair)
-        
-        # Submit transaction
-        response = self.server.submit_transaction(transaction)
+        # Build, sign and submit transaction
+        transaction = transaction_builder.build()
+        response = self._submit(transaction)
         
         logger.info(f"Sent {amount} {asset_code} to {destination}")
         return {
@@ -18,37 +18,43 @@ import os                  # Operating system interfaces, used for path operatio
 import time                # Time access and conversions, used for sleep/delay between trading cycles
 import signal              # Signal handling to catch Ctrl+C and termination signals for graceful shutdown
 import sys                 # System-specific parameters and functions, used by logger
+import threading           # Event used to interrupt the wait between cycles on shutdown
 
 # Third-party library imports
 from dotenv import load_dotenv  # Loads environment variables from .env file into os.environ
 from loguru import logger       # Advanced logging functionality with better formatting than standard logging
 
 # Local module imports
-from config.settings import Settings                  # Configuration management class that loads from environment
+from config.settings import get_settings              # Cached Settings factory that loads from environment
 from src.api.stellar_api import StellarAPI                # Wrapper for Stellar SDK to simplify network operations
 from src.strategies.xlm_usdc_simple import XlmUsdcSimpleStrategy  # XLM/USDC swing trading strategy
 from src.utils.logger import setup_logger                 # Custom logger configuration for file and console output
 
 # Global variables
-# This flag controls the main loop execution; when set to False, the bot will exit gracefully
-running = True
+# This event controls the main loop execution; once set, the bot will exit gracefully.
+shutdown_event = threading.Event()
+
+# The main loop waits on this event between cycles (instead of time.sleep), so a
+# shutdown signal or a streamed XLM price change cuts the wait short
+wake_event = threading.Event()
 
 def signal_handler(sig, frame):
     """
     Handle exit signals gracefully
     
     This function is registered as a handler for SIGINT (Ctrl+C) and SIGTERM signals.
-    When these signals are received, it sets the global 'running' flag to False,
-    which will cause the main loop to exit after the current iteration completes.
+    When these signals are received, it sets the global 'shutdown_event', which causes
+    the main loop to exit after the current iteration completes, and 'wake_event', which
+    wakes the loop if it is waiting between cycles.
     This ensures that any in-progress operations can complete before shutdown.
     
     Args:
         sig: Signal number
         frame: Current stack frame
     """
-    global running
     logger.info("Shutting down bot...")
-    running = False
+    shutdown_event.set()
+    wake_event.set()
 
 def main():
     """
@@ -74,7 +80,7 @@ def main():
     
     # Initialize settings from environment variables
     # The Settings class handles validation and default values
-    settings = Settings()
+    settings = get_settings()
     logger.info(f"Network: {settings.network}")
     logger.info(f"Trading pair: {settings.base_asset}/{settings.quote_asset}")
     
@@ -90,51 +96,80 @@ def main():
     # Check if the account exists on the network and retrieve its information
     # This verifies that the provided secret key is valid and the account is funded
     # If the account doesn't exist or isn't funded, an exception will be raised
-    account_info = stellar_api.get_account_info()
+    # The same response also seeds the transaction account and balance caches
+    account_info = stellar_api.warmup()
     logger.info(f"Account: {account_info['account_id']}")
     
     # Get and log the native XLM balance for quick reference
     # This helps verify that the account has sufficient funds to operate
-    logger.info(f"Account balance: {stellar_api.get_balance()}")
+    # Reuses the account info fetched above instead of another Horizon call
+    logger.info(f"Account balance: {stellar_api.get_balance(account_info=account_info)}")
     
     # Initialize the XLM/USDC swing trading strategy
     # This strategy buys when price drops and sells when price rises
     strategy = XlmUsdcSimpleStrategy(
         stellar_api=stellar_api,  # API instance for Stellar network operations
-        settings=settings         # Configuration settings for the strategy
+        settings=settings,        # Configuration settings for the strategy
+        wake_event=wake_event     # Set by the strategy when the streamed price moves
     )
     
+    # Open the strategy's Horizon streams (live prices and balances)
+    strategy.start()
+    
     # Log startup information before entering the main loop
     # This provides confirmation that the bot is running
     logger.info("Bot running with XLM/USDC swing trading strategy")
     logger.info(f"Polling interval: {settings.polling_interval} seconds")
     
     # Main trading loop - this will run continuously until the bot is stopped
-    # The 'running' flag is controlled by the signal handler when the process
+    # The 'shutdown_event' is set by the signal handler when the process
     # receives an interrupt signal (Ctrl+C) or termination signal
-    while running:
+    #
+    # Cycles are scheduled against a monotonic deadline rather than sleeping a
+    # fixed interval after each one, so the time spent in strategy.execute()
+    # doesn't push every later cycle back (no cumulative drift)
+    next_tick = time.monotonic()
+    while not shutdown_event.is_set():
+        # Only a cycle that reached its deadline advances the schedule; cycles
+        # woken early by a price change run in between without shifting it
+        if time.monotonic() >= next_tick:
+            next_tick += settings.polling_interval
+        
         try:
             # Execute one cycle of the trading strategy
             # This is where all the trading logic happens - analyzing market conditions,
             # making trading decisions, and executing trades when appropriate
             # The actual implementation depends on the strategy being used
+            # Scheduled cycles run one polling interval apart, which prevents excessive
+            # API calls; the polling_interval is configurable (default: 60 seconds)
             strategy.execute()
             
-            # Wait for the specified polling interval before the next cycle
-            # This prevents excessive API calls and allows time for market conditions to change
-            # The polling_interval is configurable in the settings (default: 60 seconds)
-            time.sleep(settings.polling_interval)
-            
         except Exception as e:
             # Catch and log any errors that occur during strategy execution
             # This prevents the bot from crashing if there's a temporary issue
             # with the network, API, or other external factors
             logger.error(f"Error in main loop: {str(e)}")
             
-            # Wait the polling interval before trying again
+            # Wait a full polling interval from now before trying again
             # This provides a pause to allow transient issues to resolve
-            # before the next execution attempt
-            time.sleep(settings.polling_interval)
+            # and avoids a tight retry loop on persistent failures
+            next_tick = time.monotonic() + settings.polling_interval
+        
+        # If a cycle overran its slot, skip the missed ticks instead of
+        # running several cycles back to back to catch up
+        now = time.monotonic()
+        if next_tick < now:
+            next_tick = now
+        
+        # Wait until the next deadline, returning early if a shutdown signal
+        # arrives or the streamed price changes
+        wake_event.wait(next_tick - now)
+        wake_event.clear()
+    
+    # Stop the strategy's streams and release the pooled Horizon connections
+    # before exiting
+    strategy.stop()
+    stellar_api.close()
 
 if __name__ == "__main__":
     # This block only executes when the script is run directly (not imported)
@@ -1,17 +1,16 @@
 """
 Base strategy module for Stellar Trading Bot
 """
-from abc import ABC, abstractmethod
 from typing import Dict, Any
 
 from loguru import logger
 
-class BaseStrategy(ABC):
+class BaseStrategy:
     """
-    Abstract base class for all trading strategies
+    Base class for all trading strategies
     
     All strategy implementations should inherit from this class
-    and implement the execute method.
+    and override the execute method.
     """
     
     def __init__(self, stellar_api, settings):
@@ -24,10 +23,34 @@ class BaseStrategy(ABC):
         """
         self.stellar_api = stellar_api
         self.settings = settings
+        
+        # Settings are immutable, so copy the values strategies read on every
+        # cycle onto the instance once instead of going through settings each time
+        self.base_asset = settings.base_asset
+        self.quote_asset = settings.quote_asset
+        self.quote_asset_issuer = settings.quote_asset_issuer
+        self.buy_threshold = settings.buy_threshold
+        self.sell_threshold = settings.sell_threshold
+        self.max_spread = settings.max_spread
+        self.min_profit = settings.min_profit
         self.name = "base"
         logger.debug(f"Initialized {self.name} strategy")
     
-    @abstractmethod
+    def start(self):
+        """
+        Start any background work the strategy needs (e.g. price streams)
+        
+        Called once by the entry point before the trading loop. The default
+        does nothing.
+        """
+    
+    def stop(self):
+        """
+        Stop background work started by start()
+        
+        Called once by the entry point on shutdown. The default does nothing.
+        """
+    
     def execute(self) -> Dict[str, Any]:
         """
         Execute the trading strategy
@@ -37,7 +60,7 @@ class BaseStrategy(ABC):
         Returns:
             Dict with execution results
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement execute()")
     
     def get_name(self) -> str:
         """
@@ -10,31 +10,50 @@ This strategy uses a combination of percentage-based price movements and time-ba
 3. Sells XLM when price rises 5% above our last buy price
 4. Repeats this cycle to capture price movements while protecting against extended downtrends
 """
-from typing import Dict, Any, Tuple
-from decimal import Decimal
+from typing import Dict, Any, Optional, Tuple
+from collections import deque
+from decimal import ROUND_DOWN, Decimal
 import time
 import os
 import json
+import threading
 from loguru import logger
+from stellar_sdk.exceptions import BaseHorizonError, ConnectionError
 
 from src.strategies.base_strategy import BaseStrategy
 
+# Decimal constants used on every cycle, built once at import
+DEC_ZERO = Decimal('0')
+DEC_ONE = Decimal('1')
+XLM_RESERVE = Decimal('5')  # XLM kept back for the Stellar minimum balance + fees
+STROOP = Decimal('0.0000001')  # Smallest amount Stellar can represent
+PRICE_HISTORY_SIZE = 1000  # Price points kept in memory
+SECONDS_PER_HOUR = 3600
+NOT_DUE_REASON = 'Price checked recently'  # Skip reason when execute() ran no check
+
+# Directory for persisted strategy state, resolved once at import
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
+PRICE_LOG_MAX_LINES = 10000  # Price log is compacted back to PRICE_HISTORY_SIZE lines past this
+
 class XlmUsdcSimpleStrategy(BaseStrategy):
     """
     Swing trading strategy for XLM/USDC that capitalizes on price movements:
     - Buys when price drops 2% from last sell OR 5 hours have passed since selling OR price drops 3% in 12 hours
     - Sells when price rises 5% from last buy
-    - Checks price every minute
+    - Checks price every minute, and on every streamed order book change
     - Tracks price history with timestamps
     """
     
-    def __init__(self, stellar_api, settings):
+    def __init__(self, stellar_api, settings, wake_event: Optional[threading.Event] = None):
         """
         Initialize the strategy
         
         Args:
             stellar_api: StellarAPI instance
             settings: Settings instance
+            wake_event: Optional event set whenever the streamed best ask
+                changes, so the caller's loop can run execute() right away
+                instead of waiting out its polling interval
         """
         super().__init__(stellar_api, settings)
         self.name = "xlm_usdc_simple"
@@ -42,8 +61,21 @@ class XlmUsdcSimpleStrategy(BaseStrategy):
         # Create assets
         self.xlm_asset = self.stellar_api.create_asset("XLM")  # Native asset
         self.usdc_asset = self.stellar_api.create_asset(
-            settings.quote_asset, 
-            settings.quote_asset_issuer
+            self.quote_asset, 
+            self.quote_asset_issuer
+        )
+        
+        # Asset arguments for our offers; the Asset objects built above are
+        # passed straight through, so nothing is re-resolved per trade
+        self._buy_kwargs_static = dict(
+            buying_code='XLM', buying_issuer=None,
+            selling_code=self.quote_asset, selling_issuer=self.quote_asset_issuer,
+            buying_asset=self.xlm_asset, selling_asset=self.usdc_asset
+        )
+        self._sell_kwargs_static = dict(
+            selling_code='XLM', selling_issuer=None,
+            buying_code=self.quote_asset, buying_issuer=self.quote_asset_issuer,
+            selling_asset=self.xlm_asset, buying_asset=self.usdc_asset
         )
         
         # Trading parameters
@@ -56,10 +88,29 @@ class XlmUsdcSimpleStrategy(BaseStrategy):
         self.buy_timeout_hours = 5  # Buy back in after 5 hours if no 2% drop
         self.price_drop_lookback_hours = 12  # Lookback window for price drop detection
         self.significant_drop_percentage = Decimal('0.03')  # Buy when price drops 3% in lookback window
+        
+        # Derived thresholds, fixed for the life of the strategy
+        self._buy_mult = DEC_ONE - self.buy_drop_percentage  # Buy target = last sell * this
+        self._sell_mult = DEC_ONE + self.sell_rise_percentage  # Sell target = last buy * this
+        self._buy_timeout_sec = self.buy_timeout_hours * SECONDS_PER_HOUR
+        self._lookback_sec = self.price_drop_lookback_hours * SECONDS_PER_HOUR
+        self._neg_drop = -self.significant_drop_percentage
+        
+        # Percentages as display strings for log and reason messages
+        self._buy_pct_str = str(self.buy_drop_percentage * 100)
+        self._sell_pct_str = str(self.sell_rise_percentage * 100)
+        self._drop_pct_str = str(self.significant_drop_percentage * 100)
         self.trading_enabled = getattr(settings, 'trading_enabled', True)
         
+        # Cycle gate on the monotonic clock, so wall-clock adjustments
+        # can't skip or stall price checks. The slack lets a caller polling
+        # on the same interval through, even if this wake-up landed slightly
+        # earlier relative to its deadline than the last one did
+        self._interval_ns = self.price_check_interval * 1_000_000_000
+        self._gate_ns = self._interval_ns - self._interval_ns // 10
+        self._last_check_ns = None
+        
         # State variables
-        self.last_price_check = 0
         self.last_sell_price = None
         self.last_buy_price = None
         self.last_sell_time = None  # Timestamp of last sell
@@ -68,62 +119,280 @@ class XlmUsdcSimpleStrategy(BaseStrategy):
         self.waiting_for_sell = False  # True if we've bought and are waiting to sell
         self.initial_reference_set = False
         
+        # Buy/sell targets derived from the last trade prices; recomputed by
+        # _update_targets() whenever those prices change, not every cycle
+        self._buy_target = None
+        self._sell_target = None
+        
+        # Balances are cached between cycles and refreshed at most every
+        # _balance_ttl seconds, or straight after one of our own orders
+        self._balance_ttl = getattr(settings, 'account_cache_ttl', 30)
+        self._balance_cache = None  # (xlm_balance, usdc_balance, fetched_at)
+        
+        # While the account stream is up it keeps the cache current, so the
+        # cached balances are used regardless of age
+        self._account_streaming = False
+        
         # Price history tracking with timestamps
-        self.price_history = []  # List of (timestamp, price) tuples
+        # Bounded ring of (timestamp, price) tuples; the oldest point is
+        # evicted automatically once it's full
+        self.price_history = deque(maxlen=PRICE_HISTORY_SIZE)
+        
+        # Rolling maximum for the drop lookback window: a monotonic deque of
+        # (timestamp, price) with strictly decreasing prices, so the window
+        # high is always at the front
+        self._window_max = deque()
+        
+        # Best ask kept current by Horizon's order book stream on a
+        # background thread; None while the stream is down, in which case
+        # get_xlm_price() falls back to polling
+        self._live_best_ask = None
+        self._price_changed = False  # Streamed best ask moved since the last execute()
+        self._wake_event = wake_event
+        self._stream_lock = threading.Lock()
+        
+        # Stream threads are only started by start(), and end once
+        # _stop_streams is set; each start() gets a fresh event so threads
+        # from an earlier run can't be revived by a restart
+        self._stop_streams = threading.Event()
+        self._stream_thread = None
+        self._account_stream_thread = None
         
         # Try to load state from file
-        self.state_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                                      'data', 'xlm_usdc_state.json')
+        self.state_file = os.path.join(DATA_DIR, 'xlm_usdc_state.json')
+        os.makedirs(DATA_DIR, exist_ok=True)  # Once, not per save
+        
+        # Price points go to an append-only log next to the state file, so
+        # the state file is only rewritten when the trading state changes
+        self.prices_file = os.path.join(DATA_DIR, 'xlm_usdc_prices.jsonl')
+        self._price_log_lines = 0
+        self._price_log_torn = False  # Log ends in a partial line from a crash
+        self._saved_state_data = None  # Last JSON written to the state file
+        
         self._load_state()
         
         logger.info(f"Initialized {self.name} swing trading strategy")
-        logger.info(f"Buy when price drops: {self.buy_drop_percentage * 100}%")
+        logger.info(f"Buy when price drops: {self._buy_pct_str}%")
         logger.info(f"Buy timeout: {self.buy_timeout_hours} hours")
-        logger.info(f"Buy on {self.significant_drop_percentage * 100}% drop in {self.price_drop_lookback_hours} hours")
-        logger.info(f"Sell when price rises: {self.sell_rise_percentage * 100}%")
+        logger.info(f"Buy on {self._drop_pct_str}% drop in {self.price_drop_lookback_hours} hours")
+        logger.info(f"Sell when price rises: {self._sell_pct_str}%")
         logger.info(f"Price check interval: {self.price_check_interval} seconds")
         logger.info(f"Max XLM per trade: {self.max_xlm_per_trade} XLM")
         logger.info(f"Max USDC per trade: {self.max_usdc_per_trade} USDC")
     
-    def get_xlm_price(self) -> Tuple[Decimal, Dict]:
+    def start(self):
+        """Start the order book and account streams on background threads"""
+        if self._stream_thread is not None:
+            return
+        
+        self._stop_streams = threading.Event()
+        self._stream_thread = threading.Thread(
+            target=self._stream_order_book,
+            name='order-book-stream',
+            daemon=True
+        )
+        self._stream_thread.start()
+        
+        self._account_stream_thread = threading.Thread(
+            target=self._stream_account,
+            name='account-stream',
+            daemon=True
+        )
+        self._account_stream_thread.start()
+    
+    def stop(self):
+        """
+        Stop the streams started by start()
+        
+        The threads finish at their next stream update or retry; they are
+        daemons, so a stream blocked waiting for Horizon can't hold up exit.
+        """
+        self._stop_streams.set()
+        self._stream_thread = None
+        self._account_stream_thread = None
+        
+        with self._stream_lock:
+            self._live_best_ask = None
+        self._account_streaming = False
+    
+    def _stream_order_book(self):
+        """
+        Keep the live best ask current from Horizon's order book stream
+        
+        Runs on a background thread until stop() is called. Each update
+        is parsed here, so readers only ever pick up a ready Decimal. If the
+        stream drops, the live price is cleared (so prices are polled again)
+        and the stream is reopened with exponential backoff.
+        """
+        stop_streams = self._stop_streams
+        retry_delay = 1
+        while not stop_streams.is_set():
+            try:
+                for order_book in self.stellar_api.stream_order_book(
+                    selling_asset=self.xlm_asset,
+                    buying_asset=self.usdc_asset,
+                    limit=1  # Only the best ask is used
+                ):
+                    if stop_streams.is_set():
+                        return
+                    best_ask = self._best_ask(order_book)
+                    with self._stream_lock:
+                        changed = best_ask != self._live_best_ask
+                        self._live_best_ask = best_ask
+                        if changed:
+                            self._price_changed = True
+                    if changed and self._wake_event is not None:
+                        self._wake_event.set()
+                    retry_delay = 1
+            except Exception as e:
+                logger.warning(f"Order book stream disconnected: {str(e)}. Falling back to polling.")
+            
+            with self._stream_lock:
+                self._live_best_ask = None
+            
+            stop_streams.wait(retry_delay)
+            retry_delay = min(retry_delay * 2, 60)
+    
+    def _stream_account(self):
+        """
+        Keep the balance cache current from Horizon's account stream
+        
+        Runs on a background thread until stop() is called. If the
+        stream drops, the cache falls back to its TTL (so balances are polled
+        again) and the stream is reopened with exponential backoff.
+        """
+        stop_streams = self._stop_streams
+        retry_delay = 1
+        while not stop_streams.is_set():
+            try:
+                for account_info in self.stellar_api.stream_account():
+                    if stop_streams.is_set():
+                        return
+                    xlm_balance, usdc_balance = self.check_balances(account_info)
+                    self._balance_cache = (xlm_balance, usdc_balance, time.monotonic())
+                    self._account_streaming = True
+                    retry_delay = 1
+            except Exception as e:
+                logger.warning(f"Account stream disconnected: {str(e)}. Falling back to polling.")
+            
+            self._account_streaming = False
+            
+            stop_streams.wait(retry_delay)
+            retry_delay = min(retry_delay * 2, 60)
+    
+    @staticmethod
+    def _best_ask(order_book: Dict) -> Decimal:
+        """
+        Get the best (lowest) ask from an order book - what we'd pay to buy XLM
+        
+        Args:
+            order_book: Order book data from Horizon
+            
+        Returns:
+            Best ask price, or 0 if there are no asks
+        """
+        asks = order_book.get('asks', [])
+        return Decimal(asks[0].get('price', '0')) if asks else DEC_ZERO
+    
+    def get_xlm_price(self) -> Decimal:
         """
         Get current XLM price in USDC
         
+        Uses the streamed best ask when available, so the common case is a
+        plain memory read rather than a Horizon request.
+        
         Returns:
-            Tuple of (price, order_book_data)
+            Best ask price in USDC per XLM, or 0 if there are no asks
         """
+        with self._stream_lock:
+            best_ask = self._live_best_ask
+        
+        if best_ask is not None:
+            return best_ask
+        
         order_book = self.stellar_api.get_order_book(
             selling_asset=self.xlm_asset,
-            buying_asset=self.usdc_asset
+            buying_asset=self.usdc_asset,
+            limit=1  # Only the best ask is used
         )
+        return self._best_ask(order_book)
+    
+    def check_balances(self, account_info: Optional[Dict] = None) -> Tuple[Decimal, Decimal]:
+        """
+        Check account balances
         
-        # Get best price (lowest ask price - what we'd pay to buy XLM)
-        asks = order_book.get('asks', [])
-        best_price = Decimal(asks[0].get('price', '0')) if asks else Decimal('0')
+        Args:
+            account_info: Optional account snapshot to read from instead of
+                fetching the account
+        
+        Returns:
+            Tuple of (xlm_balance, usdc_balance)
+        """
+        # One account fetch; both balances come from the same snapshot
+        balances = self.stellar_api.get_all_balances(account_info=account_info)
+        xlm_balance = balances.get(('XLM', None), DEC_ZERO)
+        usdc_balance = balances.get((self.quote_asset, self.quote_asset_issuer), DEC_ZERO)
         
-        return best_price, order_book
+        logger.debug("Current balances: {} XLM, {} USDC", xlm_balance, usdc_balance)
+        return xlm_balance, usdc_balance
     
-    def check_balances(self) -> Tuple[Decimal, Decimal]:
+    def _refresh_balances(self) -> Tuple[Decimal, Decimal]:
         """
-        Check account balances
+        Fetch balances from Horizon and store them in the balance cache
         
         Returns:
             Tuple of (xlm_balance, usdc_balance)
         """
-        # Get XLM balance
-        xlm_balance = self.stellar_api.get_balance(
-            asset_code="XLM"
-        )
+        xlm_balance, usdc_balance = self.check_balances()
+        self._balance_cache = (xlm_balance, usdc_balance, time.monotonic())
+        return xlm_balance, usdc_balance
+    
+    def _cached_balances(self):
+        """
+        Get balances from the cache if they are still fresh
         
-        # Get USDC balance
-        usdc_balance = self.stellar_api.get_balance(
-            asset_code=self.settings.quote_asset,
-            asset_issuer=self.settings.quote_asset_issuer
-        )
+        Returns:
+            Tuple of (xlm_balance, usdc_balance), or None if the cache is stale
+        """
+        balance_cache = self._balance_cache
+        if balance_cache is None:
+            return None
+        
+        xlm_balance, usdc_balance, fetched_at = balance_cache
+        if not self._account_streaming and time.monotonic() - fetched_at >= self._balance_ttl:
+            return None
         
-        logger.debug(f"Current balances: {xlm_balance} XLM, {usdc_balance} USDC")
         return xlm_balance, usdc_balance
     
+    def _get_balances(self) -> Tuple[Decimal, Decimal]:
+        """
+        Get balances from the cache, refreshing them from Horizon if stale
+        
+        Returns:
+            Tuple of (xlm_balance, usdc_balance)
+        """
+        balances = self._cached_balances()
+        return balances if balances is not None else self._refresh_balances()
+    
+    def _can_trade(self, xlm_balance: Decimal, usdc_balance: Decimal) -> bool:
+        """
+        Check whether the side we're waiting on could place an order at all
+        
+        Args:
+            xlm_balance: Current XLM balance
+            usdc_balance: Current USDC balance
+            
+        Returns:
+            bool: False if the balances rule out the next trade
+        """
+        if self.waiting_for_buy:
+            return usdc_balance > DEC_ZERO
+        if self.waiting_for_sell:
+            return xlm_balance > XLM_RESERVE
+        
+        # Initial reference or inconsistent state; let execute() handle it
+        return True
+    
     def execute_buy(self, price: Decimal, xlm_balance: Decimal, usdc_balance: Decimal) -> Dict:
         """
         Execute buy order (Buy XLM with USDC)
@@ -142,22 +411,20 @@ class XlmUsdcSimpleStrategy(BaseStrategy):
             usdc_balance / price  # How much we could buy with our USDC
         )
         
-        if max_xlm_can_buy < Decimal('1'):
+        if max_xlm_can_buy < DEC_ONE:
             logger.warning(f"Not enough USDC to buy XLM. Need at least {price} USDC.")
             return {'success': False, 'reason': 'Insufficient USDC balance'}
         
-        # Round to 7 decimal places (Stellar precision)
-        amount_to_buy = round(max_xlm_can_buy, 7)
+        # Truncate to 7 decimal places (Stellar precision); rounding up
+        # could ask for more than the balance covers
+        amount_to_buy = max_xlm_can_buy.quantize(STROOP, rounding=ROUND_DOWN)
         
         # Create the buy offer
         try:
             result = self.stellar_api.create_buy_offer(
-                buying_code="XLM",
-                buying_issuer=None,  # XLM is native asset
-                selling_code=self.settings.quote_asset,
-                selling_issuer=self.settings.quote_asset_issuer,
-                amount=str(amount_to_buy),
-                price=str(price)
+                **self._buy_kwargs_static,
+                amount=amount_to_buy,
+                price=price
             )
             
             logger.info(f"Buy order placed: {amount_to_buy} XLM at {price} USDC/XLM")
@@ -180,7 +447,7 @@ class XlmUsdcSimpleStrategy(BaseStrategy):
             Dict with execution results
         """
         # Keep 5 XLM as reserve (Stellar minimum + fees)
-        available_xlm = xlm_balance - Decimal('5')
+        available_xlm = xlm_balance - XLM_RESERVE
         
         # Calculate how much to sell
         amount_to_sell = min(
@@ -188,22 +455,20 @@ class XlmUsdcSimpleStrategy(BaseStrategy):
             available_xlm  # Available balance
         )
         
-        if amount_to_sell <= Decimal('0'):
+        if amount_to_sell <= DEC_ZERO:
             logger.warning(f"Not enough XLM to sell. Need more than 5 XLM.")
             return {'success': False, 'reason': 'Insufficient XLM balance'}
         
-        # Round to 7 decimal places (Stellar precision)
-        amount_to_sell = round(amount_to_sell, 7)
+        # Truncate to 7 decimal places (Stellar precision); rounding up
+        # could dip into the reserve
+        amount_to_sell = amount_to_sell.quantize(STROOP, rounding=ROUND_DOWN)
         
         # Create the sell offer
         try:
             result = self.stellar_api.create_sell_offer(
-                selling_code="XLM",
-                selling_issuer=None,  # XLM is native asset
-                buying_code=self.settings.quote_asset,
-                buying_issuer=self.settings.quote_asset_issuer,
-                amount=str(amount_to_sell),
-                price=str(price)
+                **self._sell_kwargs_static,
+                amount=amount_to_sell,
+                price=price
             )
             
             logger.info(f"Sell order placed: {amount_to_sell} XLM at {price} USDC/XLM")
@@ -213,176 +478,387 @@ class XlmUsdcSimpleStrategy(BaseStrategy):
             logger.error(f"Error placing sell order: {str(e)}")
             return {'success': False, 'error': str(e)}
             
-    def detect_significant_drop(self, lookback_hours: int, drop_percentage: Decimal) -> bool:
+    def detect_significant_drop(
+        self,
+        lookback_hours: Optional[int] = None,
+        drop_percentage: Optional[Decimal] = None,
+        *,
+        current_price: Optional[Decimal] = None
+    ) -> bool:
         """
         Detect if there's been a significant price drop within the lookback window
         
+        The window is always the strategy's configured lookback, since the
+        rolling maximum is maintained for that window only.
+        
         Args:
-            lookback_hours: Number of hours to look back
-            drop_percentage: The price drop percentage to detect (e.g., 0.03 for 3%)
+            lookback_hours: Number of hours to look back; only the configured
+                lookback is supported (default: the strategy's lookback)
+            drop_percentage: The price drop percentage to detect, e.g. 0.03
+                for 3% (default: the strategy's significant drop percentage)
+            current_price: Price to compare against the window high
+                (default: the latest point in the price history)
             
         Returns:
             bool: True if a significant drop is detected, False otherwise
-        """
-        if not self.price_history or len(self.price_history) < 2:
-            return False
             
-        # Get current time and price
-        current_time = time.time()
-        current_price = self.price_history[-1][1] if self.price_history else None
+        Raises:
+            ValueError: If lookback_hours differs from the configured lookback
+        """
+        if lookback_hours is not None and lookback_hours != self.price_drop_lookback_hours:
+            raise ValueError(f"Only the configured lookback of {self.price_drop_lookback_hours} hours "
+                             f"is supported, got {lookback_hours}")
         
-        if current_price is None:
+        if len(self.price_history) < 2:
             return False
             
-        # Calculate the lookback window timestamp
-        lookback_timestamp = current_time - (lookback_hours * 3600)
-        
-        # Find the highest price within the lookback window
-        prices_in_window = [(ts, price) for ts, price in self.price_history 
-                           if ts >= lookback_timestamp]
+        # Get current price
+        if current_price is None:
+            current_price = self.price_history[-1][1]
         
-        if not prices_in_window:
+        # The front of the rolling maximum is the highest price in the window
+        window_max = self._evict_window_max(time.time())
+        if not window_max:
             return False
             
-        highest_price_in_window = max(prices_in_window, key=lambda x: x[1])[1]
+        highest_price_in_window = window_max[0][1]
         
         # Calculate the percentage drop from the highest price
         if highest_price_in_window > 0:
             price_change = (current_price - highest_price_in_window) / highest_price_in_window
             
             # If price dropped by the specified percentage or more
-            if price_change <= -drop_percentage:
-                logger.info(f"Detected {abs(price_change) * 100:.2f}% price drop in the last {lookback_hours} hours")
-                logger.info(f"Highest price: {highest_price_in_window}, Current price: {current_price}")
+            drop_limit = self._neg_drop if drop_percentage is None else -drop_percentage
+            if price_change <= drop_limit:
+                logger.info("Detected {:.2f}% price drop in the last {} hours", abs(price_change) * 100,
+                            self.price_drop_lookback_hours)
+                logger.info("Highest price: {}, Current price: {}", highest_price_in_window, current_price)
                 return True
                 
         return False
     
+    def _record_price(self, timestamp: float, price: Decimal):
+        """
+        Append a price point to the history and the rolling window maximum
+        
+        Args:
+            timestamp: Unix timestamp of the price
+            price: XLM price in USDC
+        """
+        self.price_history.append((timestamp, price))
+        self._push_window_max(timestamp, price)
+        self._evict_window_max(timestamp)
+        self._append_price_log(timestamp, price)
+    
+    def _push_window_max(self, timestamp: float, price: Decimal):
+        """
+        Push a price point onto the rolling window maximum deque
+        
+        Points at or below the new price can never be the window high again,
+        so they're dropped from the back before appending.
+        
+        Args:
+            timestamp: Unix timestamp of the price
+            price: XLM price in USDC
+        """
+        window_max = self._window_max
+        while window_max and window_max[-1][1] <= price:
+            window_max.pop()
+        window_max.append((timestamp, price))
+    
+    def _evict_window_max(self, now: float) -> deque:
+        """
+        Drop points older than the lookback window from the rolling maximum
+        
+        Args:
+            now: Current Unix timestamp
+            
+        Returns:
+            The rolling window maximum deque
+        """
+        window_max = self._window_max
+        lookback_timestamp = now - self._lookback_sec
+        while window_max and window_max[0][0] < lookback_timestamp:
+            window_max.popleft()
+        return window_max
+    
+    @staticmethod
+    def _price_log_line(timestamp: float, price: Decimal) -> str:
+        """Serialize a price point as one line of the price log"""
+        return json.dumps({'timestamp': timestamp, 'price': str(price)}, separators=(',', ':')) + '\n'
+    
+    def _append_price_log(self, timestamp: float, price: Decimal):
+        """
+        Append a price point to the price log
+        
+        Once the log passes PRICE_LOG_MAX_LINES it is compacted back down to
+        the in-memory history.
+        
+        Args:
+            timestamp: Unix timestamp of the price
+            price: XLM price in USDC
+        """
+        line = self._price_log_line(timestamp, price)
+        if self._price_log_torn:
+            # Terminate the partial line so this point starts a line of its own
+            line = '\n' + line
+        try:
+            with open(self.prices_file, 'a') as f:
+                f.write(line)
+            self._price_log_lines += 1
+            self._price_log_torn = False
+        except Exception as e:
+            logger.error(f"Failed to append to price log: {e}")
+            return
+        
+        if self._price_log_lines >= PRICE_LOG_MAX_LINES:
+            self._rewrite_price_log()
+    
+    def _rewrite_price_log(self):
+        """Replace the price log with the in-memory price history"""
+        try:
+            tmp_file = self.prices_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                f.write(''.join(self._price_log_line(ts, p) for ts, p in self.price_history))
+            os.replace(tmp_file, self.prices_file)
+            self._price_log_lines = len(self.price_history)
+            self._price_log_torn = False
+        except Exception as e:
+            logger.error(f"Failed to rewrite price log: {e}")
+    
+    def _load_price_history(self, legacy_history=None):
+        """
+        Load price history from the tail of the price log
+        
+        Lines that don't parse (e.g. a write cut short by a crash) are
+        skipped individually rather than discarding the whole history.
+        
+        Args:
+            legacy_history: price_history entries from an older state file;
+                used, and moved into the price log, when there's no log yet
+        """
+        migrate = False
+        try:
+            tail = deque(maxlen=PRICE_HISTORY_SIZE)
+            line_count = 0
+            with open(self.prices_file, 'r') as f:
+                for line_count, line in enumerate(f, 1):
+                    tail.append(line)
+            self._price_log_lines = line_count
+            
+            # A last line without its newline is a write cut short by a crash;
+            # the next append has to start on a fresh line
+            self._price_log_torn = bool(tail) and not tail[-1].endswith('\n')
+            entries = [line for line in tail if line.endswith('\n')]
+        except FileNotFoundError:
+            entries = legacy_history or []
+            migrate = bool(entries)
+        except Exception as e:
+            logger.warning(f"Failed to load price log: {e}. Will start with empty price history.")
+            return
+        
+        points = []
+        skipped = 0
+        for entry in entries:
+            try:
+                if isinstance(entry, str):
+                    entry = json.loads(entry)
+                points.append((entry['timestamp'], Decimal(str(entry['price']))))
+            except Exception:
+                skipped += 1
+        if skipped:
+            logger.warning("Skipped {} unreadable price log entries", skipped)
+        
+        self.price_history = deque(points, maxlen=PRICE_HISTORY_SIZE)
+        for timestamp, price in self.price_history:
+            self._push_window_max(timestamp, price)
+        
+        if migrate:
+            self._rewrite_price_log()
+    
+    def _update_targets(self):
+        """Recompute the buy/sell target prices from the last trade prices"""
+        self._buy_target = self.last_sell_price * self._buy_mult if self.last_sell_price else None
+        self._sell_target = self.last_buy_price * self._sell_mult if self.last_buy_price else None
+    
     def _load_state(self):
         """Load trading state from file if it exists"""
+        legacy_history = None
         try:
-            # Ensure the data directory exists
-            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-            
-            if os.path.exists(self.state_file):
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                    
-                    # Convert string to Decimal where needed
-                    if state.get('last_sell_price'):
-                        self.last_sell_price = Decimal(str(state['last_sell_price']))
-                    if state.get('last_buy_price'):
-                        self.last_buy_price = Decimal(str(state['last_buy_price']))
-                    
-                    self.last_sell_time = state.get('last_sell_time')
-                    self.last_buy_time = state.get('last_buy_time')
-                    self.waiting_for_buy = state.get('waiting_for_buy', False)
-                    self.waiting_for_sell = state.get('waiting_for_sell', False)
-                    self.initial_reference_set = state.get('initial_reference_set', False)
-                    
-                    # Load price history if it exists
-                    if state.get('price_history'):
-                        self.price_history = [(entry['timestamp'], Decimal(str(entry['price']))) 
-                                            for entry in state['price_history']]
-                    
-                    logger.info(f"Loaded trading state: last_sell_price={self.last_sell_price}, " 
-                                f"last_buy_price={self.last_buy_price}, waiting_for_buy={self.waiting_for_buy}, "
-                                f"waiting_for_sell={self.waiting_for_sell}")
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+                
+                # Prices are saved as strings so they round-trip exactly;
+                # older state files stored floats, which str() also handles
+                if state.get('last_sell_price'):
+                    self.last_sell_price = Decimal(str(state['last_sell_price']))
+                if state.get('last_buy_price'):
+                    self.last_buy_price = Decimal(str(state['last_buy_price']))
+                
+                self.last_sell_time = state.get('last_sell_time')
+                self.last_buy_time = state.get('last_buy_time')
+                self.waiting_for_buy = state.get('waiting_for_buy', False)
+                self.waiting_for_sell = state.get('waiting_for_sell', False)
+                self.initial_reference_set = state.get('initial_reference_set', False)
+                
+                # Older state files carried the price history inline
+                legacy_history = state.get('price_history')
+                
+                logger.info(f"Loaded trading state: last_sell_price={self.last_sell_price}, " 
+                            f"last_buy_price={self.last_buy_price}, waiting_for_buy={self.waiting_for_buy}, "
+                            f"waiting_for_sell={self.waiting_for_sell}")
                                 
+        except FileNotFoundError:
+            # No saved state yet; start fresh
+            pass
         except Exception as e:
             logger.warning(f"Failed to load state file: {e}. Will start with fresh state.")
+        
+        self._load_price_history(legacy_history)
+        self._update_targets()
     
     def _save_state(self):
-        """Save trading state to file"""
+        """Save trading state to file, unless it's unchanged since the last save"""
         try:
-            # Ensure the data directory exists
-            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-            
             state = {
-                'last_sell_price': float(self.last_sell_price) if self.last_sell_price else None,
-                'last_buy_price': float(self.last_buy_price) if self.last_buy_price else None,
+                'last_sell_price': str(self.last_sell_price) if self.last_sell_price else None,
+                'last_buy_price': str(self.last_buy_price) if self.last_buy_price else None,
                 'last_sell_time': self.last_sell_time,
                 'last_buy_time': self.last_buy_time,
                 'waiting_for_buy': self.waiting_for_buy,
                 'waiting_for_sell': self.waiting_for_sell,
-                'initial_reference_set': self.initial_reference_set,
-                'price_history': [{'timestamp': ts, 'price': float(p)} for ts, p in self.price_history[-100:]]  # Save last 100 prices
+                'initial_reference_set': self.initial_reference_set
             }
             
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            data = json.dumps(state, separators=(',', ':'))
+            if data == self._saved_state_data:
+                return
+            
+            # Write to a temp file and swap it in, so a crash mid-write
+            # never leaves a truncated state file behind; the fsync makes
+            # sure the new contents are on disk before the rename lands
+            tmp_file = self.state_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.state_file)
+            self._saved_state_data = data
                 
             logger.debug(f"Saved trading state to {self.state_file}")
             
         except Exception as e:
             logger.error(f"Failed to save state file: {e}")
                 
-    def establish_initial_reference(self, current_price):
+    def establish_initial_reference(
+        self,
+        current_price,
+        xlm_balance: Optional[Decimal] = None,
+        current_time: Optional[float] = None
+    ):
         """
         Establish initial reference price by selling 1 XLM
         
         Args:
             current_price: Current XLM price in USDC
+            xlm_balance: Current XLM balance, if the caller already has it;
+                fetched from Horizon otherwise
+            current_time: Timestamp current_price was recorded at in the price
+                history; if omitted, the price is recorded now
             
         Returns:
             Dict with execution results
         """
-        logger.info(f"Establishing initial reference price by selling {self.initial_reference_amount} XLM at {current_price} USDC")
+        logger.info("Establishing initial reference price by selling {} XLM at {} USDC", self.initial_reference_amount, current_price)
         
         # Check that we have enough XLM (at least 1 XLM + 5 XLM reserve)
-        xlm_balance, _ = self.check_balances()
+        if xlm_balance is None:
+            xlm_balance, _ = self.check_balances()
         
-        if xlm_balance < (self.initial_reference_amount + Decimal('5')):
-            logger.error(f"Not enough XLM to establish reference. Need at least {self.initial_reference_amount + Decimal('5')} XLM.")
+        if xlm_balance < (self.initial_reference_amount + XLM_RESERVE):
+            logger.error("Not enough XLM to establish reference. Need at least {} XLM.", self.initial_reference_amount + XLM_RESERVE)
             return {'success': False, 'reason': 'Insufficient XLM balance for initial reference'}
         
         # Execute sell order for 1 XLM
         try:
             result = self.stellar_api.create_sell_offer(
-                selling_code="XLM",
-                selling_issuer=None,  # XLM is native asset
-                buying_code=self.settings.quote_asset,
-                buying_issuer=self.settings.quote_asset_issuer,
-                amount=str(self.initial_reference_amount),
-                price=str(current_price)
+                **self._sell_kwargs_static,
+                amount=self.initial_reference_amount,
+                price=current_price
             )
             
+            # Our order moved the balances; refetch next cycle
+            self._balance_cache = None
+            
             # Update state
+            if current_time is None:
+                current_time = time.time()
+                self._record_price(current_time, current_price)
+            
             self.last_sell_price = current_price
-            self.last_sell_time = time.time()
+            self.last_sell_time = current_time
             self.waiting_for_buy = True
             self.waiting_for_sell = False
             self.initial_reference_set = True
-            
-            # Update price history
-            self.price_history.append((self.last_sell_time, current_price))
+            self._update_targets()
             
             # Save state
             self._save_state()
             
-            logger.info(f"Initial reference sell order placed: {self.initial_reference_amount} XLM at {current_price} USDC/XLM")
-            logger.info(f"Waiting for price to drop {self.buy_drop_percentage * 100}% below {current_price} USDC to buy back")
+            logger.info("Initial reference sell order placed: {} XLM at {} USDC/XLM", self.initial_reference_amount, current_price)
+            logger.info("Waiting for price to drop {}% below {} USDC to buy back", self._buy_pct_str, current_price)
             
             return {'success': True, 'result': result}
             
         except Exception as e:
-            logger.error(f"Error establishing initial reference: {str(e)}")
+            logger.error("Error establishing initial reference: {}", e)
             return {'success': False, 'error': str(e)}
             
+    def warmup(self, account_info: Optional[Dict] = None):
+        """
+        Prime the price and balance paths before the first cycle
+        
+        Fetches the price once (opening the pooled Horizon connection unless
+        the stream already has a quote) and seeds the balance cache, so the
+        first execute() runs at steady-state speed. Nothing is recorded in
+        the price history.
+        
+        Args:
+            account_info: Optional account snapshot to seed balances from
+                instead of fetching the account
+        """
+        started = time.perf_counter()
+        
+        self.get_xlm_price()
+        xlm_balance, usdc_balance = self.check_balances(account_info)
+        self._balance_cache = (xlm_balance, usdc_balance, time.monotonic())
+        
+        logger.info("Warmup complete in {:.2f}s", time.perf_counter() - started)
+    
     def execute(self) -> Dict[str, Any]:
         """
         Execute the swing trading strategy
         
+        Horizon errors (including rate limiting) and dropped connections are
+        raised to the caller so it can back off; other errors are logged and
+        reported as an 'error' action.
+        
         Returns:
             Dict with execution results
         """
-        current_time = time.time()
+        now_ns = time.monotonic_ns()
+        scheduled = self._last_check_ns is None or now_ns - self._last_check_ns >= self._gate_ns
+        
+        with self._stream_lock:
+            price_changed = self._price_changed
+            self._price_changed = False
         
-        # Skip if we've checked price recently
-        if current_time - self.last_price_check < self.price_check_interval:
-            return {'action': 'skip', 'reason': 'Price checked recently'}
+        # Skip if we've checked price recently and the stream hasn't moved since
+        if not (scheduled or price_changed):
+            return {'action': 'skip', 'reason': NOT_DUE_REASON}
         
-        self.last_price_check = current_time
+        if scheduled:
+            self._last_check_ns = now_ns
         
         try:
             # Check if trading is enabled
@@ -390,67 +866,88 @@ class XlmUsdcSimpleStrategy(BaseStrategy):
                 logger.info("Trading is disabled. Skipping execution.")
                 return {'action': 'skip', 'reason': 'Trading disabled'}
             
-            # Get current price
-            current_price, _ = self.get_xlm_price()
-            logger.info(f"Current XLM price: {current_price} USDC")
+            # Only the price decides between holding and trading; balances are
+            # fetched further down, once a trade is actually due
+            current_price = self.get_xlm_price()
+            logger.debug("Current XLM price: {} USDC", current_price)
             
-            # Add to price history
+            # This one timestamp is reused for any buy/sell time recorded
+            # this cycle. Only scheduled checks go into the price history, so
+            # it keeps its one-point-per-interval spacing however often the
+            # stream wakes us. Prices are recorded even while we can't trade,
+            # so the drop detector has a full window once funds arrive
             current_time = time.time()
-            self.price_history.append((current_time, current_price))
+            if scheduled:
+                self._record_price(current_time, current_price)
             
-            # Keep only the last 1000 price points
-            if len(self.price_history) > 1000:
-                self.price_history = self.price_history[-1000:]
-            
-            # Check balances
-            xlm_balance, usdc_balance = self.check_balances()
+            # Nothing more to do if cached balances show the account can't
+            # trade anyway (e.g. while our last offer is still resting)
+            balances = self._cached_balances()
+            if balances is not None and self.initial_reference_set and not self._can_trade(*balances):
+                return {'action': 'skip', 'reason': 'Insufficient balance to trade', 'price': current_price}
             
             # First, establish initial reference if not done yet
             if not self.initial_reference_set:
                 logger.info("No initial reference price set. Establishing initial reference...")
-                result = self.establish_initial_reference(current_price)
+                xlm_balance, _ = self._get_balances()
+                result = self.establish_initial_reference(current_price, xlm_balance, current_time)
                 return {'action': 'initial_reference', 'price': current_price, 'result': result}
             
+            # Bind the trade references once; each is read several times below
+            last_sell_price = self.last_sell_price
+            last_sell_time = self.last_sell_time
+            last_buy_price = self.last_buy_price
+            
             # Implement swing trading strategy
-            if self.waiting_for_buy and self.last_sell_price and self.last_sell_time:
-                # Calculate buy target price (2% below last sell price)
-                buy_target_price = self.last_sell_price * (Decimal('1') - self.buy_drop_percentage)
+            if self.waiting_for_buy and last_sell_price and last_sell_time:
+                # Buy target price (2% below last sell price)
+                buy_target_price = self._buy_target
                 
-                # Calculate how much time has passed since last sell (in hours)
-                hours_since_sell = (current_time - self.last_sell_time) / 3600
+                # Calculate how much time has passed since last sell
+                seconds_since_sell = current_time - last_sell_time
                 
-                # Calculate price drop in the last 12 hours
-                significant_drop = self.detect_significant_drop(self.price_drop_lookback_hours, self.significant_drop_percentage)
+                # Check the cheap buy conditions first
+                price_drop_condition = current_price <= buy_target_price
+                timeout_condition = seconds_since_sell >= self._buy_timeout_sec
                 
-                logger.info(f"Waiting to buy. Current price: {current_price}, Target buy price: {buy_target_price}"
-                           f" ({self.buy_drop_percentage * 100}% below last sell of {self.last_sell_price})")
-                logger.info(f"Hours since last sell: {hours_since_sell:.2f}, Timeout: {self.buy_timeout_hours} hours")
-                logger.info(f"Detected {self.significant_drop_percentage * 100}% drop in {self.price_drop_lookback_hours}h lookback: {'Yes' if significant_drop else 'No'}")
+                # Only look for a price drop in the last 12 hours if neither
+                # of those already triggers a buy
+                lookback_drop_condition = False if (price_drop_condition or timeout_condition) else self.detect_significant_drop(current_price=current_price)
                 
-                # Check all buy conditions
-                price_drop_condition = current_price <= buy_target_price
-                timeout_condition = hours_since_sell >= self.buy_timeout_hours
-                lookback_drop_condition = significant_drop
+                # Per-tick status goes to debug; the arguments are all ready-made,
+                # so nothing is formatted unless a debug sink is attached
+                logger.debug("Waiting to buy. Current price: {}, Target buy price: {} ({}% below last sell of {})",
+                             current_price, buy_target_price, self._buy_pct_str, last_sell_price)
+                logger.opt(lazy=True).debug("Hours since last sell: {:.2f}, Timeout: {} hours",
+                                            lambda: seconds_since_sell / SECONDS_PER_HOUR, lambda: self.buy_timeout_hours)
+                logger.debug("Detected {}% drop in {}h lookback: {}",
+                             self._drop_pct_str, self.price_drop_lookback_hours,
+                             'Yes' if lookback_drop_condition else 'No')
                 
                 # If any buy condition is met, execute buy
                 if price_drop_condition or timeout_condition or lookback_drop_condition:
                     reason = []
                     if price_drop_condition:
-                        reason.append(f"Price dropped {self.buy_drop_percentage * 100}% below last sell")
+                        reason.append(f"Price dropped {self._buy_pct_str}% below last sell")
                     if timeout_condition:
                         reason.append(f"Reached {self.buy_timeout_hours}h timeout since last sell")
                     if lookback_drop_condition:
-                        reason.append(f"Detected {self.significant_drop_percentage * 100}% drop in {self.price_drop_lookback_hours}h")
+                        reason.append(f"Detected {self._drop_pct_str}% drop in {self.price_drop_lookback_hours}h")
                     
-                    logger.info(f"Buy condition met: {', '.join(reason)}. Executing buy at {current_price} USDC.")
+                    logger.info("Buy condition met: {}. Executing buy at {} USDC.", ', '.join(reason), current_price)
+                    xlm_balance, usdc_balance = self._get_balances()
                     result = self.execute_buy(current_price, xlm_balance, usdc_balance)
                     
                     if result.get('success'):
+                        # Our order moved the balances; refetch next cycle
+                        self._balance_cache = None
+                        
                         # Update state
                         self.last_buy_price = current_price
                         self.last_buy_time = current_time
                         self.waiting_for_buy = False
                         self.waiting_for_sell = True
+                        self._update_targets()
                         self._save_state()
                         
                     return {'action': 'buy', 'price': current_price, 'result': result, 'reason': reason}
@@ -458,29 +955,34 @@ class XlmUsdcSimpleStrategy(BaseStrategy):
                     # Still waiting for a buy condition to be met
                     return {'action': 'hold', 'reason': 'Waiting for buy condition', 'price': current_price}
                     
-            elif self.waiting_for_sell and self.last_buy_price:
-                # Calculate sell target price (5% above last buy price)
-                sell_target_price = self.last_buy_price * (Decimal('1') + self.sell_rise_percentage)
+            elif self.waiting_for_sell and last_buy_price:
+                # Sell target price (5% above last buy price)
+                sell_target_price = self._sell_target
                 
-                # Calculate how much time has passed since last buy (in hours)
-                hours_since_buy = (current_time - self.last_buy_time) if self.last_buy_time else 0
-                hours_since_buy /= 3600
+                # Calculate how much time has passed since last buy
+                seconds_since_buy = (current_time - self.last_buy_time) if self.last_buy_time else 0
                 
-                logger.info(f"Waiting to sell. Current price: {current_price}, Target sell price: {sell_target_price}"
-                           f" ({self.sell_rise_percentage * 100}% above last buy of {self.last_buy_price})")
-                logger.info(f"Hours since last buy: {hours_since_buy:.2f}")
+                # Per-tick status goes to debug, formatted only if a sink wants it
+                logger.debug("Waiting to sell. Current price: {}, Target sell price: {} ({}% above last buy of {})",
+                             current_price, sell_target_price, self._sell_pct_str, last_buy_price)
+                logger.opt(lazy=True).debug("Hours since last buy: {:.2f}", lambda: seconds_since_buy / SECONDS_PER_HOUR)
                 
                 # If price has risen enough, sell
                 if current_price >= sell_target_price:
-                    logger.info(f"Price {current_price} has risen {self.sell_rise_percentage * 100}% above last buy price {self.last_buy_price}. Executing sell.")
+                    logger.info("Price {} has risen {}% above last buy price {}. Executing sell.", current_price, self._sell_pct_str, last_buy_price)
+                    xlm_balance, usdc_balance = self._get_balances()
                     result = self.execute_sell(current_price, xlm_balance, usdc_balance)
                     
                     if result.get('success'):
+                        # Our order moved the balances; refetch next cycle
+                        self._balance_cache = None
+                        
                         # Update state
                         self.last_sell_price = current_price
                         self.last_sell_time = current_time
                         self.waiting_for_sell = False
                         self.waiting_for_buy = True
+                        self._update_targets()
                         self._save_state()
                         
                     return {'action': 'sell', 'price': current_price, 'result': result}
@@ -498,10 +1000,13 @@ class XlmUsdcSimpleStrategy(BaseStrategy):
                 self.last_sell_price = None
                 self.last_buy_time = None
                 self.last_sell_time = None
+                self._update_targets()
                 self._save_state()
                 
                 return {'action': 'reset', 'reason': 'State inconsistency', 'price': current_price}
                 
+        except (BaseHorizonError, ConnectionError):
+            raise
         except Exception as e:
-            logger.error(f"Error in strategy execution: {str(e)}")
+            logger.error("Error in strategy execution: {}", e)
             return {'action': 'error', 'error': str(e)}
@@ -6,6 +6,9 @@ import sys
 from datetime import datetime
 from loguru import logger
 
+# Directory for log files, resolved once at import
+LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "logs")
+
 def setup_logger(log_level="INFO"):
     """
     Set up the logger with appropriate configuration
@@ -14,31 +17,35 @@ def setup_logger(log_level="INFO"):
         log_level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
     # Create logs directory if it doesn't exist
-    logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "logs")
-    os.makedirs(logs_dir, exist_ok=True)
+    os.makedirs(LOGS_DIR, exist_ok=True)
     
     # Generate log filename with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = os.path.join(logs_dir, f"stellar_bot_{timestamp}.log")
+    log_file = os.path.join(LOGS_DIR, f"stellar_bot_{timestamp}.log")
     
     # Remove default logger
     logger.remove()
     
     # Add console logger
+    # Both sinks are enqueued, so formatting and I/O happen on loguru's
+    # writer thread rather than in the trading loop
     logger.add(
         sys.stdout,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         level=log_level,
-        colorize=True
+        colorize=True,
+        enqueue=True
     )
     
-    # Add file logger
+    # Add file logger (module name only; function/line stay on the console)
     logger.add(
         log_file,
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name} - {message}",
         level=log_level,
         rotation="10 MB",  # Rotate when file reaches 10 MB
-        retention="1 week"  # Keep logs for 1 week
+        retention="1 week",  # Keep logs for 1 week
+        compression="gz",  # Compress rotated files
+        enqueue=True
     )
     
     logger.info(f"Logger initialized with level {log_level}")
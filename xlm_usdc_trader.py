@@ -11,70 +11,211 @@ the XLM/USDC swing trading strategy. It handles:
 5. Handling graceful shutdown when interrupted
 """
 import os
+import random
 import time
 import signal
 import sys
-from datetime import datetime
+import threading
 from dotenv import load_dotenv
 from loguru import logger
+from stellar_sdk.exceptions import BadRequestError, BadResponseError, ConnectionError
 
 # Import the necessary components
 from src.api.stellar_api import StellarAPI
-from src.strategies.xlm_usdc_simple import XlmUsdcSimpleStrategy
-from config.settings import Settings
+from src.strategies.xlm_usdc_simple import NOT_DUE_REASON, XlmUsdcSimpleStrategy
+from config.settings import get_settings
+
+# Directory for log files, resolved once at import
+LOGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+
+# Priority boost applied along with CPU pinning; negative values need CAP_SYS_NICE
+PINNED_NICE_INCREMENT = -5
+
+# Adaptive polling: quiet cycles stretch the interval, failures back it off,
+# trades snap it back to settings.polling_interval
+MAX_INTERVAL_MULTIPLIER = 10  # Cap as a multiple of the base interval
+IDLE_BACKOFF = 1.5
+ERROR_BACKOFF = 2
+RATE_LIMITED_BACKOFF = 4  # Also used when Horizon is down or unreachable
+TRADE_ACTIONS = frozenset(('buy', 'sell', 'initial_reference'))
 
 # Global variables
-running = True
+shutdown_event = threading.Event()  # Set once to stop the main loop
+wake_event = threading.Event()  # Cuts the wait between cycles short
 
 def signal_handler(sig, frame):
     """Handle exit signals gracefully"""
-    global running
     logger.info("Shutting down bot...")
-    running = False
+    shutdown_event.set()
+    wake_event.set()
+
+def backoff(interval, factor, max_interval):
+    """Stretch the polling interval by factor, capped, plus up to 1s of jitter"""
+    return min(max_interval, interval * factor) + random.uniform(0, 1)
 
-def setup_logger():
-    """Set up the logger with appropriate configuration"""
+def pin_process(cpu):
+    """
+    Pin the bot to one CPU and raise its scheduling priority
+    
+    Affinity applies to the calling thread and the threads it starts later,
+    so this runs before the Horizon stream and strategy threads start.
+    Loguru's queued writer thread already exists by then and keeps the
+    default affinity.
+    
+    Best effort: if the CPU doesn't exist or the process lacks the needed
+    capability, the bot keeps running with the default scheduling.
+    
+    Args:
+        cpu: CPU number to pin to
+    """
+    try:
+        os.sched_setaffinity(0, {cpu})
+        logger.info("Pinned to CPU {}", cpu)
+        os.nice(PINNED_NICE_INCREMENT)
+    except (PermissionError, AttributeError, OSError) as e:
+        logger.warning("Could not fully apply CPU pinning/priority: {}", e)
+
+def strategy_loop(strategy, settings):
+    """
+    Run strategy cycles until shutdown is requested
+    
+    Runs on a worker thread so the main thread stays free to handle signals
+    while a cycle is blocked on Horizon.
+    
+    Args:
+        strategy: Strategy whose execute() runs each cycle
+        settings: Loaded Settings; polling_interval is the base cadence
+    """
+    try:
+        base_interval = settings.polling_interval
+        max_interval = base_interval * MAX_INTERVAL_MULTIPLIER
+        current_interval = base_interval
+        
+        # Bound once; the loop body then only touches locals
+        execute = strategy.execute
+        monotonic = time.monotonic
+        stop_requested = shutdown_event.is_set
+        wait_for_wake = wake_event.wait
+        clear_wake = wake_event.clear
+        
+        # Trading loop, scheduled against a monotonic deadline so the time
+        # spent in execute() doesn't push later cycles back
+        next_tick = monotonic()
+        while not stop_requested():
+            # Only a cycle that reached its deadline advances the schedule; cycles
+            # woken early by a price change run in between
+            if monotonic() >= next_tick:
+                next_tick += current_interval
+            
+            try:
+                # Execute one cycle of the trading strategy
+                result = execute()
+                action = result.get('action')
+                
+                if action in TRADE_ACTIONS:
+                    # Something happened, go back to the base cadence
+                    current_interval = base_interval
+                elif action == 'error':
+                    # Back off with jitter so retries don't hit Horizon in lockstep
+                    current_interval = backoff(current_interval, ERROR_BACKOFF, max_interval)
+                    next_tick = monotonic() + current_interval
+                elif result.get('reason') == NOT_DUE_REASON:
+                    # The strategy's own gate turned this cycle away, so no
+                    # check ran; that says nothing about activity
+                    pass
+                else:
+                    # Nothing to do, poll a little less often
+                    current_interval = min(max_interval, current_interval * IDLE_BACKOFF)
+                
+            except BadRequestError as e:
+                # execute() raises Horizon errors so we can back off by kind;
+                # these are logged briefly, only unexpected errors pay for a
+                # traceback
+                logger.warning("Horizon rejected request ({}): {}", e.status, e)
+                factor = RATE_LIMITED_BACKOFF if e.status == 429 else ERROR_BACKOFF
+                current_interval = backoff(current_interval, factor, max_interval)
+                next_tick = monotonic() + current_interval
+            except (BadResponseError, ConnectionError) as e:
+                logger.warning("Horizon unavailable: {}", e)
+                current_interval = backoff(current_interval, RATE_LIMITED_BACKOFF, max_interval)
+                next_tick = monotonic() + current_interval
+            except Exception:
+                logger.opt(exception=True).error("Unexpected error in trading loop")
+                current_interval = backoff(current_interval, ERROR_BACKOFF, max_interval)
+                next_tick = monotonic() + current_interval
+            
+            # Skip missed ticks rather than running cycles back to back
+            now = monotonic()
+            if next_tick < now:
+                next_tick = now
+            
+            # Wait for the next deadline, a streamed price change or a shutdown signal
+            wait_for_wake(next_tick - now)
+            clear_wake()
+    finally:
+        # If the loop dies, don't leave the main thread waiting forever
+        shutdown_event.set()
+
+def setup_logger(settings):
+    """
+    Set up the logger with appropriate configuration
+    
+    Args:
+        settings: Loaded Settings; log_level sets the level for both sinks
+    """
     # Remove default logger
     logger.remove()
     
-    # Add console logger
+    # Add console logger (no ANSI colors when piped, e.g. into journald)
     logger.add(
         sys.stdout,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level=os.getenv("LOG_LEVEL", "INFO")
+        level=settings.log_level,
+        colorize=sys.stdout.isatty()
     )
     
     # Add file logger
-    log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
-    os.makedirs(log_dir, exist_ok=True)
+    os.makedirs(LOGS_DIR, exist_ok=True)
     
-    log_file = os.path.join(
-        log_dir, 
-        f"xlm_usdc_trader_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    )
+    # One canonical file; loguru only adds a suffix when it rotates
+    log_file = os.path.join(LOGS_DIR, "xlm_usdc_trader.log")
     
+    # Enqueued so disk writes happen on loguru's writer thread rather than
+    # in the trading loop; the file is only opened on the first message
     logger.add(
         log_file,
-        rotation="10 MB",
-        retention="1 week",
+        rotation="10 MB",  # Rotate when file reaches 10 MB
+        retention="1 week",  # Keep logs for 1 week
+        compression="gz",  # Compress rotated files
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        level=os.getenv("LOG_LEVEL", "INFO")
+        level=settings.log_level,
+        enqueue=True,
+        catch=True,
+        backtrace=False,
+        diagnose=False,
+        delay=True
     )
 
 def main():
     """Main function to run the XLM/USDC trading bot"""
-    # Load environment variables from .env file
-    load_dotenv()
+    # Load environment variables from .env file; variables already set
+    # (e.g. by systemd) take precedence
+    load_dotenv(override=False)
+    
+    # Initialize settings from environment variables, once; everything
+    # below reads them from this snapshot
+    settings = get_settings()
     
     # Setup logger
-    setup_logger()
+    setup_logger(settings)
     logger.info("Starting XLM/USDC Swing Trading Bot...")
-    
-    # Initialize settings from environment variables
-    settings = Settings()
     logger.info(f"Network: {settings.network}")
     logger.info(f"Trading pair: {settings.base_asset}/{settings.quote_asset}")
     
+    # Optionally pin to a dedicated CPU to cut scheduling jitter
+    if settings.cpu_pin is not None:
+        pin_process(settings.cpu_pin)
+    
     # Initialize Stellar API with the provided credentials
     stellar_api = StellarAPI(
         secret_key=settings.stellar_secret_key,
@@ -84,9 +225,9 @@ def main():
     
     # Check if the account exists on the network
     try:
-        account_info = stellar_api.get_account_info()
+        account_info = stellar_api.warmup()
         logger.info(f"Account: {account_info['account_id']}")
-        logger.info(f"Account balance: {stellar_api.get_balance()}")
+        logger.info(f"Account balance: {stellar_api.get_balance(account_info=account_info)}")
     except Exception as e:
         logger.error(f"Error accessing Stellar account: {str(e)}")
         logger.error("Please check your STELLAR_SECRET_KEY and network settings.")
@@ -95,26 +236,39 @@ def main():
     # Initialize the XLM/USDC swing trading strategy
     strategy = XlmUsdcSimpleStrategy(
         stellar_api=stellar_api,
-        settings=settings
+        settings=settings,
+        wake_event=wake_event  # Set when the streamed price moves
     )
+    strategy.start()  # Open the live price and balance streams
+    
+    # Take first-request costs now rather than in the first trading cycle
+    try:
+        strategy.warmup(account_info=account_info)
+    except Exception as e:
+        logger.warning("Strategy warmup failed, continuing: {}", e)
     
     # Log startup information
     logger.info("Bot running with XLM/USDC swing trading strategy")
     logger.info(f"Polling interval: {settings.polling_interval} seconds")
     
-    # Main trading loop
-    while running:
-        try:
-            # Execute one cycle of the trading strategy
-            strategy.execute()
-            
-            # Wait for the specified polling interval before the next cycle
-            time.sleep(settings.polling_interval)
-            
-        except Exception as e:
-            # Catch and log any errors
-            logger.error(f"Error in main loop: {str(e)}")
-            time.sleep(settings.polling_interval)
+    # Run the strategy on a worker thread; the main thread only waits for
+    # a shutdown signal, then lets the current cycle finish
+    worker = threading.Thread(
+        target=strategy_loop,
+        args=(strategy, settings),
+        name='strategy',
+        daemon=True
+    )
+    worker.start()
+    shutdown_event.wait()
+    worker.join()
+    
+    # Stop the strategy's streams and close pooled Horizon connections
+    strategy.stop()
+    stellar_api.close()
+    
+    # Drain queued log messages before exiting
+    logger.complete()
 
 if __name__ == "__main__":
     # Register signal handlers for graceful shutdown